@@ -1,98 +1,31 @@
+import streamlit as st, pandas as pd
+from datetime import date
+
+from league_core import perf
+from league_core.assets import show_logo
+from league_core.github import PublishConflict, git_blob_sha, publish_tracker
+from league_core.ingest import apply_event, ingest_batch, read_log_folder
+from league_core.leaderboard import LeaderboardAggregator
+from league_core.league import POINTS, TRACKER_PATH, kpi_totals, read_local_tracker, read_tracker_bytes
+from league_core.pools import pool_balances, pool_running_balances, pool_summary
+from league_core.snapshot import pack_snapshot
+from league_core.sqlite_store import LEAGUE_DB, LeagueDB
+from league_core.store import LeagueStore
+from league_core.timer_log import TimerLogError, read_timer_log
+from league_core.workbook import WORKBOOK_CACHE, serialize_workbook
 
-import streamlit as st, pandas as pd, re, base64, requests
-from io import BytesIO
-from datetime import date, datetime
-
-import pandas as pd, re, base64, requests
-from io import BytesIO
-
-POINTS = {1:14,2:11,3:9,4:7,5:5,6:4,7:3,8:2,9:1,10:0.5}
-
-def parse_money(x):
-    if pd.isna(x): return 0.0
-    if isinstance(x,(int,float)): return float(x)
-    s = str(x).replace("$","").replace(",","").strip()
-    neg = False
-    if s.startswith("(") and s.endswith(")"):
-        neg = True; s = s[1:-1]
-    try:
-        v = float(s)
-        return -v if neg else v
-    except:
-        return 0.0
-
-def read_tracker_bytes(b: bytes):
-    return pd.read_excel(BytesIO(b), sheet_name=None, engine="openpyxl")
-
-def read_local_tracker():
-    try:
-        with open("tracker.xlsx","rb") as f:
-            b = f.read()
-        return read_tracker_bytes(b)
-    except Exception:
-        return None
-
-def pools_balance_robust(pools_df, pool_name):
-    if pools_df is None or isinstance(pools_df, dict) or pools_df is pd.NA:
-        return 0.0
-    if pools_df is None or pools_df.empty: return 0.0
-    df = pools_df.copy()
-    cols = {re.sub(r'[^a-z0-9]','', str(c).lower()): c for c in df.columns}
-    tcol = cols.get("type"); pcol = cols.get("pool")
-    acol = cols.get("amount") or cols.get("amt") or cols.get("value")
-    if not (tcol and pcol and acol): return 0.0
-    tmp = pd.DataFrame({
-        "_type": df[tcol].astype(str).str.strip().str.lower(),
-        "_pool": df[pcol].astype(str).str.strip().str.lower(),
-        "_amt":  df[acol].apply(parse_money)
-    })
-    tmp["_sign"] = tmp["_type"].map({"accrual":1,"payout":-1}).fillna(1)
-    return float((tmp.loc[tmp["_pool"]==pool_name.lower(), "_amt"] * tmp.loc[tmp["_pool"]==pool_name.lower(), "_sign"]).sum())
-
-def robust_leaderboard(sheet_map: dict) -> pd.DataFrame:
-    frames = []
-    for name, df in (sheet_map or {}).items():
-        if not isinstance(df, pd.DataFrame): continue
-        nm = str(name).lower()
-        if not (nm.startswith("event_") and nm.endswith("_standings")): continue
-        if df.empty: continue
-        key = {re.sub(r'[^a-z0-9]','', str(c).lower()): c for c in df.columns}
-        pcol = key.get("player") or key.get("name")
-        plcol = key.get("place") or key.get("rank") or key.get("finish") or key.get("position")
-        kcol  = key.get("kos") or key.get("knockouts") or key.get("eliminations") or key.get("elims") or key.get("numeliminated") or key.get("eliminated")
-        if not (pcol and plcol): continue
-        t = pd.DataFrame({
-            "Player": df[pcol].astype(str).str.strip(),
-            "Place": pd.to_numeric(df[plcol], errors="coerce")
-        })
-        t["KOs"] = pd.to_numeric(df[kcol], errors="coerce").fillna(0).astype(int) if kcol else 0
-        t = t.dropna(subset=["Place"])
-        t["Points"] = t["Place"].map(POINTS).fillna(0)
-        frames.append(t)
-    if not frames:
-        return pd.DataFrame(columns=["Player","Total Points","Total KOs","Events Played"])
-    all_ev = pd.concat(frames, ignore_index=True)
-    g = (all_ev.groupby("Player", as_index=False)
-         .agg(Total_Points=("Points","sum"),
-              Total_KOs=("KOs","sum"),
-              Events_Played=("Points","count"))
-         .sort_values(["Total_Points","Total_KOs"], ascending=[False,False])
-         .reset_index(drop=True))
-    g.index = g.index + 1
-    return g
-
-def show_logo(st):
-    # Do not ship/overwrite user's logo; try to load if present.
-    try:
-        st.image("league_logo.jpg", use_column_width=True)
-    except Exception:
-        try:
-            st.image("league_logo.png", use_column_width=True)
-        except Exception:
-            st.markdown("### League")
+st.set_page_config(page_title="WSOP League — Admin", page_icon="🛠️", layout="wide")
 
+# Timings are process-wide: turning them on here also records Player Home
+# sessions served by the same process. The flag only changes when someone
+# flips the toggle, and every session's toggle shows the current setting.
+def _set_perf():
+    perf.enable(st.session_state["perf_on"])
 
-st.set_page_config(page_title="WSOP League — Admin", page_icon="🛠️", layout="wide")
+st.session_state["perf_on"] = perf.enabled()
+st.sidebar.toggle("Collect timings (Performance tab)", key="perf_on", on_change=_set_perf)
+perf.bind(st.session_state.setdefault("perf", perf.Recorder()))
+rerun_timer = perf.Timer("rerun.admin")
 
 col_logo, col_title = st.columns([1,4])
 with col_logo: show_logo(st)
@@ -111,6 +44,10 @@ else:
     sheet_map = read_local_tracker()
     st.sidebar.info("Using repo tracker.xlsx.")
 
+# Batch-ingested events are kept for the session until published or discarded.
+if sheet_map is not None:
+    sheet_map.update(st.session_state.get("pending_sheets", {}))
+
 st.sidebar.header("GitHub (optional publish)")
 owner_repo = st.sidebar.text_input("Repo (owner/repo)", value="mmartuko15/wsop-league-app")
 branch = st.sidebar.text_input("Branch", value="main")
@@ -118,15 +55,8 @@ token = st.secrets.get("GITHUB_TOKEN","")
 if not token:
     token = st.sidebar.text_input("GITHUB_TOKEN (repo scope)", type="password")
 
-def backfill_kpis(sheet_map):
-    pools = sheet_map.get("Pools_Ledger", pd.DataFrame())
-    wsop_total = pools_balance_robust(pools,"WSOP")
-    bounty_total = pools_balance_robust(pools,"Bounty")
-    highhand_total = pools_balance_robust(pools,"High Hand")
-    nightly_total = pools_balance_robust(pools,"Nightly")
-    return wsop_total, bounty_total, highhand_total, nightly_total
-
-wsop_total, bounty_total, highhand_total, nightly_total = backfill_kpis(sheet_map if sheet_map else {})
+wsop_total, bounty_total, highhand_total, nightly_total = kpi_totals(
+    pool_balances((sheet_map or {}).get("Pools_Ledger", pd.DataFrame())))
 
 k1,k2,k3,k4,k5 = st.columns(5)
 k1.metric("WSOP Pool", f"${wsop_total:,.2f}")
@@ -135,97 +65,59 @@ k3.metric("Bounty Pool (live)", f"${bounty_total:,.2f}")
 k4.metric("High Hand (live)", f"${highhand_total:,.2f}")
 k5.metric("Nightly Pool (post-payout)", f"${nightly_total:,.2f}")
 
-tabs = st.tabs(["Leaderboard","Events","Add New Event (Timer Log)","Opt-Ins","High Hand (Preview)","Pools Ledger","Supplies","Download/Publish"])
+# Read once: another session can flip the process-wide flag mid-rerun.
+show_perf = perf.enabled()
+tabs = st.tabs(["Leaderboard","Events","Add New Event (Timer Log)","Opt-Ins","High Hand (Preview)","Pools Ledger","Supplies","Download/Publish"] + (["Performance"] if show_perf else []))
 
 with tabs[0]:
-    lb = robust_leaderboard(sheet_map or {})
+    lb_engine = st.session_state.setdefault("lb_engine", LeaderboardAggregator(POINTS))
+    lb = lb_engine.sync(sheet_map or {}).to_frame()
     st.dataframe(lb, use_container_width=True)
 
 with tabs[1]:
     st.dataframe((sheet_map or {}).get("Events", pd.DataFrame()), use_container_width=True)
 
 with tabs[2]:
-    st.subheader("Upload timer export (HTML)")
-    new_log = st.file_uploader("Timer Log Export (HTML)", type=["html","csv","txt"], key="newlog")
+    st.subheader("Upload timer export (HTML or CSV)")
+    new_log = st.file_uploader("Timer Log Export (HTML/CSV)", type=["html","csv","txt"], key="newlog")
     if new_log and sheet_map is not None:
         try:
-            raw = new_log.read()
-            try:
-                html = base64.b64decode(raw).decode("utf-8","ignore")
-            except Exception:
-                html = raw.decode("utf-8","ignore")
-            tables = pd.read_html(html)
-            ps = tables[0].copy()
-            rp = tables[1].copy()
-
-            def n(df): return {re.sub(r'[^a-z0-9]','', str(c).lower()): c for c in df.columns}
-            psn = n(ps)
-            name_col   = psn.get("name") or psn.get("player")
-            place_col  = psn.get("place") or psn.get("rank") or psn.get("finish") or psn.get("position")
-            payout_col = psn.get("payout")
-            kos_col    = psn.get("kos") or psn.get("eliminations") or psn.get("eliminated") or psn.get("knockouts") or psn.get("numeliminated")
-            if not (name_col and place_col and payout_col):
-                st.error("Timer log missing required columns (Name/Player, Place, Payout).")
-            else:
-                standings = ps[[place_col, payout_col, name_col] + ([kos_col] if kos_col else [])].copy()
-                standings.columns = ["Place","Payout","Player"] + (["KOs"] if kos_col else [])
-                if "KOs" not in standings.columns: standings["KOs"]=0
-                standings["Place"] = pd.to_numeric(standings["Place"], errors="coerce")
-                standings = standings.dropna(subset=["Place"])
-                standings["KOs"] = pd.to_numeric(standings["KOs"], errors="coerce").fillna(0).astype(int)
-                standings["Points"] = standings["Place"].map(POINTS).fillna(0)
-                standings["Bounty $ (KOs*5)"] = standings["KOs"]*5
-                widx = standings.index[standings["Place"]==1]
-                if len(widx): standings.loc[widx[0],"Bounty $ (KOs*5)"] += 5
-                standings["Payout_Amount"] = standings["Payout"].apply(parse_money)
-
-                ev_nums = [int(n.split("_")[1]) for n in (sheet_map or {}).keys() if str(n).startswith("Event_") and str(n).endswith("_Standings")]
-                ev_next = (max(ev_nums)+1) if ev_nums else 1
-
-                events_df = (sheet_map or {}).get("Events", pd.DataFrame())
-                try:
-                    e_date = str(events_df[events_df["Event #"]==ev_next]["Date"].iloc[0])
-                except Exception:
-                    e_date = str(date.today())
-
-                # Update Players sheet
-                rpn = n(rp)
-                players_field = rpn.get("players") or list(rp.columns)[0]
-                players_list = [p.strip() for p in str(rp.iloc[0][players_field]).split(",") if p.strip()]
-                players_sheet = (sheet_map or {}).get("Players", pd.DataFrame(columns=["Player","Active"])).copy()
-                existing = set(players_sheet["Player"]) if not players_sheet.empty else set()
-                for p in players_list:
-                    if p not in existing:
-                        players_sheet.loc[len(players_sheet)] = [p, True]
-                sheet_map["Players"] = players_sheet
-
-                # Pools ledger accruals & nightly payout
-                pools = (sheet_map or {}).get("Pools_Ledger", pd.DataFrame(columns=["Date","Event #","Type","Pool","Amount","Immediate?","Note"])).copy()
-                n_players = len(players_list)
-                accruals = pd.DataFrame([
-                    [e_date, ev_next, "Accrual","WSOP",      3*n_players,  "", "WSOP addl funding ($3 x players)"],
-                    [e_date, ev_next, "Accrual","Nightly",  45*n_players, "", "Nightly payout funding ($45 x players)"],
-                    [e_date, ev_next, "Accrual","Bounty",    5*n_players, "", "Bounty pool funding ($5 x players)"],
-                    [e_date, ev_next, "Accrual","High Hand", 2*n_players, "", "High hand funding ($2 x players)"],
-                    [e_date, ev_next, "Payout","Nightly",    float(standings["Payout_Amount"].sum()), "Yes", "Paid out on event night based on finish order"],
-                ], columns=["Date","Event #","Type","Pool","Amount","Immediate?","Note"])
-                pools = pd.concat([pools, accruals], ignore_index=True)
-                sheet_map["Pools_Ledger"] = pools
-
-                # Supplies: add server tip if missing
-                supplies = (sheet_map or {}).get("Supplies", pd.DataFrame(columns=["Event #","Date","Item","Amount","Notes"])).copy()
-                mask = (supplies["Event #"]==ev_next) & (supplies["Item"]=="Server Tip")
-                if supplies[mask].empty:
-                    supplies.loc[len(supplies)] = [ev_next, e_date, "Server Tip", 100.00, "Auto-added"]
-                sheet_map["Supplies"] = supplies
-
-                # Save Event sheet
-                sheet_map[f"Event_{ev_next}_Standings"] = standings
-                st.success(f"Ingested event #{ev_next}. Remember to publish.")
+            standings, players_list = read_timer_log(new_log.read(), POINTS)
+            ev_next = apply_event(sheet_map, standings, players_list)
+            st.success(f"Ingested event #{ev_next}. Remember to publish.")
 
+        except TimerLogError as e:
+            st.error(str(e))
         except Exception as e:
             st.error(f"Could not add event: {e}")
 
+    st.subheader("Batch ingest (many timer logs)")
+    batch_files = st.file_uploader("Timer Log Exports", type=["html","csv","txt"], accept_multiple_files=True, key="batchlogs")
+    batch_dir = st.text_input("…or a folder of timer logs on this machine", value="")
+    st.caption("Files are applied in file-name order (event2 before event10), all at once or not at all.")
+    # A single upload above is re-applied on every rerun and never saved, so
+    # a batch built on top of it would keep half of that event.
+    if new_log:
+        st.caption("Remove the single timer log above to ingest a batch.")
+    if st.button("Ingest batch", disabled=bool(new_log)) and sheet_map is not None:
+        try:
+            files = [(f.name, f.getvalue()) for f in (batch_files or [])]
+            if batch_dir.strip():
+                files += read_log_folder(batch_dir.strip())
+            changes, report = ingest_batch(sheet_map, files, POINTS)
+            st.dataframe(pd.DataFrame(report["files"]), use_container_width=True, hide_index=True)
+            if changes is None:
+                st.error("Batch not applied: fix the files with errors and try again.")
+            else:
+                st.session_state["pending_sheets"] = {**st.session_state.get("pending_sheets", {}), **changes}
+                sheet_map.update(changes)
+                st.success(f"Ingested {len(files)} events in {report['seconds']:.2f}s. Remember to publish.")
+        except Exception as e:
+            st.error(f"Could not ingest batch: {e}")
+    if st.session_state.get("pending_sheets") and st.button("Discard batch-ingested events"):
+        del st.session_state["pending_sheets"]
+        st.rerun()
+
 with tabs[3]:
     st.subheader("Second Chance Opt-Ins (Events 8–12)")
     players_sheet = (sheet_map or {}).get("Players", pd.DataFrame(columns=["Player"]))
@@ -235,10 +127,9 @@ with tabs[3]:
     existing_for_event = set(current[current["Event #"]==event_choice]["Player"]) if not current.empty else set()
     selected = st.multiselect("Players opting in", all_players, default=list(existing_for_event))
     if st.button("Save Opt-Ins"):
-        current = current[current["Event #"]!=event_choice]
-        for p in selected:
-            current.loc[len(current)] = [event_choice, p, "Y", 100.00]
-        sheet_map["SecondChance_OptIns"] = current.sort_values(["Event #","Player"]).reset_index(drop=True)
+        store = LeagueStore(sheet_map)
+        store.set_optins(event_choice, selected)
+        store.flush()
         st.success("Saved opt-ins.")
 
 with tabs[4]:
@@ -248,7 +139,11 @@ with tabs[4]:
 
 with tabs[5]:
     st.subheader("Pools Ledger")
-    st.dataframe((sheet_map or {}).get("Pools_Ledger", pd.DataFrame()), use_container_width=True)
+    ledger = (sheet_map or {}).get("Pools_Ledger", pd.DataFrame())
+    st.dataframe(pool_summary(ledger, split=True), use_container_width=True)
+    with st.expander("Running balance by event"):
+        st.dataframe(pool_running_balances(ledger), use_container_width=True, hide_index=True)
+    st.dataframe(ledger, use_container_width=True)
     st.caption("Accruals are added when you ingest events; add payouts for immediate High Hand or season-end as needed.")
 
 with tabs[6]:
@@ -257,11 +152,65 @@ with tabs[6]:
 
 with tabs[7]:
     st.subheader("Export your changes")
-    # rebuild workbook from current sheet_map
-    with pd.ExcelWriter("updated_tracker.xlsx", engine="openpyxl") as writer:
-        for name, df in (sheet_map or {}).items():
-            if isinstance(df, pd.DataFrame):
-                df.to_excel(writer, sheet_name=str(name)[:31], index=False)
-    with open("updated_tracker.xlsx","rb") as f:
-        updated_bytes = f.read()
-    st.download_button("Download updated tracker (.xlsx)", data=updated_bytes, file_name="tracker.xlsx")
+    # Serializing the workbook is the slow part of this tab, so it only
+    # happens when one of these buttons is pressed.
+    c1, c2, c3 = st.columns(3)
+    if c1.button("Build updated tracker (.xlsx)"):
+        updated_bytes = serialize_workbook(sheet_map or {})
+        st.download_button("Download updated tracker (.xlsx)", data=updated_bytes, file_name="tracker.xlsx")
+        # Columnar snapshot of exactly what the xlsx will read back as, for
+        # fast Player Home cold starts. Rebuilt only when the bytes change.
+        try:
+            snap_zip = pack_snapshot(read_tracker_bytes(updated_bytes), updated_bytes)
+            st.download_button("Download snapshot (.zip)", data=snap_zip, file_name="tracker.snapshot.zip")
+            st.caption("Unzip next to tracker.xlsx on the server to skip the first parse there; it is ignored once the xlsx changes.")
+        except ImportError:
+            st.caption("Install pyarrow to also export a fast-load snapshot.")
+    if c2.button("Publish to GitHub", disabled=not (token and owner_repo)):
+        # The edits started from the uploaded or repo tracker (or from this
+        # session's last publish of it); GitHub must still have that blob.
+        if uploaded:
+            loaded_sha = git_blob_sha(uploaded.getvalue())
+        else:
+            try:
+                with open(TRACKER_PATH, "rb") as f:
+                    loaded_sha = git_blob_sha(f.read())
+            except OSError:
+                loaded_sha = None
+        base_sha = st.session_state.get("published_sha", {}).get(loaded_sha, loaded_sha)
+        try:
+            res = publish_tracker(owner_repo, branch, token, serialize_workbook(sheet_map or {}), base_sha,
+                                  message=f"Update tracker ({date.today()})")
+            st.session_state["published_sha"] = {loaded_sha: res["sha"]}
+            if res["skipped"]:
+                st.info("GitHub already has this exact tracker; nothing to commit.")
+            else:
+                st.success(f"Published to {owner_repo}@{branch} (commit {res['commit'][:7]}).")
+        except PublishConflict as e:
+            st.error(f"Tracker changed on GitHub since it was read ({e}). Reload and try again.")
+        except Exception as e:
+            st.error(f"Publish failed: {e}")
+    if c3.button(f"Save to SQLite ({LEAGUE_DB})"):
+        with LeagueDB(LEAGUE_DB) as db:
+            written = db.save_sheets(sheet_map or {}, exact=True)
+        st.success(f"Saved {len(written)} changed of {len(sheet_map or {})} sheets to {LEAGUE_DB}; "
+                   "Player Home can read it directly.")
+
+rerun_timer.stop()
+
+if show_perf:
+    with tabs[8]:
+        st.subheader("Where reruns spend their time")
+        st.caption("Milliseconds per span; p50/p95 over the most recent calls. Counters are cache hits/misses.")
+        mine = st.session_state["perf"]
+        for label, rec in [("This session", mine), ("All sessions in this process", perf.RECORDER)]:
+            st.write(f"**{label}**")
+            st.dataframe(rec.stats().round(2), use_container_width=True, hide_index=True)
+            st.json(rec.counters(), expanded=False)
+        st.write("**Workbook cache**", WORKBOOK_CACHE.stats())
+        c1, c2, c3 = st.columns(3)
+        c1.download_button("Download timings (.json)", data=perf.RECORDER.to_json(), file_name="league_perf.json")
+        c2.download_button("Download timings (.csv)", data=perf.RECORDER.to_csv(), file_name="league_perf.csv")
+        if c3.button("Reset timings"):
+            perf.RECORDER.reset()
+            mine.reset()
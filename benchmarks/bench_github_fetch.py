@@ -0,0 +1,38 @@
+"""Time cold vs revalidated tracker fetches against the local GitHub stand-in.
+
+    python benchmarks/bench_github_fetch.py [latency_seconds]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from league_core.github import fetch_tracker
+from league_core.github_stub import GitHubStub
+from league_core.workbook import WORKBOOK_CACHE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(latency: float = 0.05, repeats: int = 5):
+    with open(os.path.join(ROOT, "tracker.xlsx"), "rb") as f:
+        data = f.read()
+    WORKBOOK_CACHE.clear()
+    with GitHubStub({("league/app", "tracker.xlsx", "main"): data}, latency=latency) as gh:
+        t = time.perf_counter()
+        _, info = fetch_tracker("league/app", "main", api_base=gh.base_url)
+        cold = time.perf_counter() - t
+        assert not info["cached"]
+        warm = []
+        for _ in range(repeats):
+            t = time.perf_counter()
+            _, info = fetch_tracker("league/app", "main", api_base=gh.base_url)
+            warm.append(time.perf_counter() - t)
+            assert info["cached"] and info["status"] == 304
+        print(f"latency={latency*1000:.0f} ms  cold={cold*1000:.1f} ms  "
+              f"revalidated={min(warm)*1000:.1f} ms  stub={gh.stats}  cache={WORKBOOK_CACHE.stats()}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05)
@@ -0,0 +1,54 @@
+"""Compare per-cell parse_money against parse_money_series on a large ledger.
+
+    python benchmarks/bench_money.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from league_core.money import parse_money, parse_money_series
+
+
+def synthetic_amounts(rows: int, seed: int = 0) -> pd.Series:
+    # Mix of what shows up in a hand-edited Pools_Ledger: plain numbers,
+    # "$1,234.50", accounting negatives, blanks and the odd typo.
+    rng = np.random.default_rng(seed)
+    amt = rng.uniform(0, 5000, rows).round(2)
+    kind = rng.integers(0, 6, rows)
+    vals = np.empty(rows, dtype=object)
+    vals[kind == 0] = amt[kind == 0]
+    vals[kind == 1] = [f"${v:,.2f}" for v in amt[kind == 1]]
+    vals[kind == 2] = [f"(${v:,.2f})" for v in amt[kind == 2]]
+    vals[kind == 3] = [f"{v:.2f}" for v in amt[kind == 3]]
+    vals[kind == 4] = np.nan
+    vals[kind == 5] = [("", "n/a", " 12 ", "TBD")[i % 4] for i in range((kind == 5).sum())]
+    return pd.Series(vals)
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return min(times), result
+
+
+def main(rows: int = 200_000):
+    mixed = synthetic_amounts(rows)
+    numeric = pd.Series(np.random.default_rng(1).uniform(0, 5000, rows).round(2))
+    for label, s in (("mixed text", mixed), ("numeric", numeric)):
+        t_apply, a = best_of(lambda: s.apply(parse_money))
+        t_vec, b = best_of(lambda: parse_money_series(s))
+        assert np.array_equal(a.to_numpy(dtype=float), b.to_numpy()), "results differ"
+        print(f"{label:<10} rows={rows:,}  apply={t_apply*1000:.1f} ms  "
+              f"vectorized={t_vec*1000:.1f} ms  speedup={t_apply/t_vec:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,130 @@
+"""Benchmark the tracker data path on synthetic trackers; prints JSON.
+
+    python benchmarks/run.py --seasons 1 3 10 --events 12 --players 40 --ledger-rows 0 10000
+    python benchmarks/run.py --out results.json
+
+For every parameter combination each stage is timed ``--repeat`` times
+(reported: best and median seconds, rows per second on the best run) and
+run once more under tracemalloc for peak Python/NumPy allocation.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_tracker
+from league_core.columns import is_event_sheet
+from league_core.facts import build_event_facts, clear_facts_cache, event_sort_key, event_views
+from league_core.finance import build_financials, financials
+from league_core.leaderboard import LeaderboardAggregator
+from league_core.league import POINTS
+from league_core.pools import pool_balances, pool_summary
+from league_core.projection import season_inputs, simulate
+from league_core.workbook import lazy_workbook, parse_workbook, serialize_workbook
+
+
+def _time(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_bytes": peak}
+
+
+def _render_data(xlsx: bytes):
+    # What a cold Player Home render computes from workbook bytes.
+    clear_facts_cache()
+    sheets = lazy_workbook(xlsx)
+    LeaderboardAggregator(POINTS).sync(sheets).to_frame()
+    pool_balances(sheets.get("Pools_Ledger"))
+    build_event_facts(sheets)
+    build_financials(sheets)
+
+
+def stages(sheets: dict, xlsx: bytes):
+    ev_rows = sum(len(df) for k, df in sheets.items() if k.startswith("Event_"))
+    ledger = sheets["Pools_Ledger"]
+    warm = LeaderboardAggregator(POINTS).sync(sheets)
+    # totals for every event but the newest, which each run then adds
+    last = max((k for k in sheets if is_event_sheet(k)), key=event_sort_key)
+    before = LeaderboardAggregator(POINTS).sync({k: v for k, v in sheets.items() if k != last})
+    g = season_inputs(sheets, POINTS)
+    sim_inputs = [g[c].to_numpy() for c in ("Points", "KOs", "Attend", "Strength", "KO_Rate")]
+    return {
+        "leaderboard_cold": (lambda: LeaderboardAggregator(POINTS).sync(sheets).to_frame(), ev_rows),
+        "leaderboard_add_event": (lambda: before.add_event(last, sheets[last]).to_frame(), len(sheets[last]),
+                                  lambda: before.sync({k: v for k, v in sheets.items() if k != last}).to_frame()),
+        "leaderboard_warm": (lambda: warm.sync(sheets).to_frame(), ev_rows),
+        "pool_balances": (lambda: pool_balances(ledger), len(ledger)),
+        "pool_summary_split": (lambda: pool_summary(ledger, split=True), len(ledger)),
+        "event_facts": (lambda: build_event_facts(sheets), ev_rows),
+        "event_views": (lambda: (clear_facts_cache(), event_views(sheets)), ev_rows),
+        "financials": (lambda: (clear_facts_cache(), build_financials(sheets)), ev_rows),
+        "financials_view_warm": (lambda: financials(sheets), ev_rows),
+        "xlsx_write": (lambda: serialize_workbook(sheets), ev_rows + len(ledger)),
+        "xlsx_read_all": (lambda: parse_workbook(xlsx), ev_rows + len(ledger)),
+        "xlsx_read_lazy_one": (lambda: lazy_workbook(xlsx)["Pools_Ledger"], len(ledger)),
+        "render_data_cold": (lambda: _render_data(xlsx), ev_rows + len(ledger)),
+        "projection_20k_x12": (lambda: simulate(*sim_inputs, POINTS, 12, sims=20000), 20000 * 12),
+    }
+
+
+def run(seasons, events, players, ledger_rows, repeat=3, only=None):
+    results = []
+    for s, e, p, lr in itertools.product(seasons, events, players, ledger_rows):
+        sheets = synthetic_tracker(seasons=s, events=e, players=p, ledger_rows=lr)
+        xlsx = serialize_workbook(sheets)
+        params = {"seasons": s, "events": e, "players": p, "ledger_rows": lr, "xlsx_bytes": len(xlsx)}
+        for name, (fn, rows, *setup) in stages(sheets, xlsx).items():
+            if only and name not in only:
+                continue
+            r = _time(fn, repeat, *setup)
+            r.update(params, stage=name, rows=rows, rows_per_s=rows / r["best_s"] if r["best_s"] else None)
+            results.append(r)
+            print(f"{name:<22} {params}  {r['best_s']*1000:9.2f} ms", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seasons", type=int, nargs="+", default=[1, 5])
+    ap.add_argument("--events", type=int, nargs="+", default=[12])
+    ap.add_argument("--players", type=int, nargs="+", default=[40])
+    ap.add_argument("--ledger-rows", type=int, nargs="+", default=[0, 10000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--stage", action="append", help="only run these stages")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+    report = {
+        "python": platform.python_version(), "pandas": pd.__version__,
+        "machine": platform.machine(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": run(args.seasons, args.events, args.players, args.ledger_rows, args.repeat, args.stage),
+    }
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Synthetic multi-season trackers for benchmarking.
+
+Trackers use the real sheet names and rotate through the column spellings
+the loose column matching accepts (Player/Name, Place/Rank/Finish/Position,
+KOs/Knockouts/Eliminations/Elims, Amount/Amt/Value), with Payout cells mixing
+numbers, "$1,234" strings and blanks like a hand-edited workbook.
+"""
+import numpy as np
+import pandas as pd
+
+PLAYER_COLS = ["Player", "Name"]
+PLACE_COLS = ["Place", "Rank", "Finish", "Position"]
+KO_COLS = ["KOs", "Knockouts", "Eliminations", "Elims"]
+AMOUNT_COLS = ["Amount", "Amt", "Value"]
+POOLS = ["WSOP", "Nightly", "Bounty", "High Hand"]
+
+
+def synthetic_tracker(seasons=1, events=12, players=40, roster=None, ledger_rows=0, seed=0) -> dict:
+    """Sheet map with ``seasons * events`` Event_N_Standings sheets of
+    ``players`` rows each, drawn from a roster of ``roster`` names, and a
+    Pools_Ledger padded with ``ledger_rows`` extra rows."""
+    rng = np.random.default_rng(seed)
+    roster = roster or max(players + 10, int(players * 1.25))
+    names = np.array([f"Player {i:04d}" for i in range(roster)], dtype=object)
+    n_events = seasons * events
+    start = pd.Timestamp("2025-08-01")
+    dates = [start + pd.Timedelta(weeks=3 * i) for i in range(n_events)]
+
+    sheets = {
+        "Events": pd.DataFrame({"Event #": range(1, n_events + 1), "Date": dates,
+                                "Start Time": "6:30 PM", "Location Name": "Countryside Country Club"}),
+    }
+    ledger = []
+    supplies = []
+    for e in range(1, n_events + 1):
+        field = rng.choice(names, size=min(players, roster), replace=False)
+        n = len(field)
+        kos = rng.multinomial(n - 1, np.ones(n) / n)
+        payout = np.zeros(n)
+        pool = 45 * n
+        payout[:3] = np.round(pool * np.array([0.5, 0.3, 0.2]))
+        pay_cells = np.empty(n, dtype=object)
+        for i, v in enumerate(payout):
+            pay_cells[i] = ("" if not v else (f"${v:,.0f}" if i % 2 else int(v)))
+        v = e - 1
+        sheets[f"Event_{e}_Standings"] = pd.DataFrame({
+            PLACE_COLS[v % len(PLACE_COLS)]: np.arange(1, n + 1),
+            "Payout": pay_cells,
+            PLAYER_COLS[v % len(PLAYER_COLS)]: field,
+            KO_COLS[v % len(KO_COLS)]: kos,
+            "Bounty $ (KOs*5)": kos * 5,
+            "Payout_Amount": payout,
+        })
+        d = dates[e - 1]
+        for pool_name, per in (("WSOP", 3), ("Nightly", 45), ("Bounty", 5), ("High Hand", 2)):
+            ledger.append([d, e, "Accrual", pool_name, per * n, "", ""])
+        ledger.append([d, e, "Payout", "Nightly", float(payout.sum()), "Yes", ""])
+        supplies.append([e, d, "Server Tip", 100.0, "Auto-added"])
+
+    amt_col = AMOUNT_COLS[seed % len(AMOUNT_COLS)]
+    cols = ["Date", "Event #", "Type", "Pool", amt_col, "Immediate?", "Note"]
+    extra = pd.DataFrame({
+        "Date": start, "Event #": rng.integers(0, n_events + 1, ledger_rows),
+        "Type": rng.choice(["Accrual", "Payout", "accrual "], ledger_rows),
+        "Pool": rng.choice(POOLS + ["wsop", " high hand"], ledger_rows),
+        amt_col: [f"${a:,.2f}" if i % 3 == 0 else (f"({a:.2f})" if i % 7 == 0 else a)
+                  for i, a in enumerate(rng.uniform(1, 500, ledger_rows).round(2))],
+        "Immediate?": "", "Note": "",
+    }, columns=cols)
+    sheets["Pools_Ledger"] = pd.concat([pd.DataFrame(ledger, columns=cols), extra], ignore_index=True)
+    sheets["Supplies"] = pd.DataFrame(supplies, columns=["Event #", "Date", "Item", "Amount", "Notes"])
+    sheets["Players"] = pd.DataFrame({"Player": names, "Active": True})
+    sheets["Series_BuyIns"] = pd.DataFrame({"Player": names, "Amount": 200.0, "Date": start, "Method": "cash"})
+    sheets["SecondChance_OptIns"] = pd.DataFrame({"Event #": 8, "Player": names[:10], "Opt-In (Y/N)": "Y", "Buy-In ($)": 100.0})
+    sheets["HighHand_Info"] = pd.DataFrame({"Current Holder": ["nobody"], "Hand Description": ["need quads to qualify"],
+                                            "Display Value (override)": [np.nan], "Last Updated": [start], "Note": [np.nan]})
+    return sheets
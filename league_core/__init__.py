@@ -0,0 +1,10 @@
+"""Compute engine for the WSOP League apps.
+
+The Streamlit apps (``app.py``, ``player_home.py``) are thin UIs over this
+package, and it can be driven headless from scripts and the benchmarks:
+nothing here imports Streamlit, and openpyxl, requests and pyarrow are only
+imported when a workbook is parsed, GitHub is called or a snapshot is used.
+Parsed workbooks, event facts and finance views are cached process-wide.
+
+Start with ``league_core.league`` (points table, tracker loading).
+"""
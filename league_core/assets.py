@@ -0,0 +1,124 @@
+"""League logo and other static assets shared by both apps.
+
+Images are decoded once per process and turned into small variants (a JPEG
+sized for the logo column, or WebP for static pages) whose bytes are cached
+process-wide and keyed on the source file's (mtime, size). Each variant
+carries the SHA-256 of its bytes: Streamlit's media URLs are derived from
+the content, so an unchanged logo keeps the same URL across reruns and
+sessions and browsers cache it, and ``Asset.filename`` gives the same kind
+of stable name for static hosting.
+
+Without Pillow the original file bytes are served unchanged.
+"""
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import NamedTuple
+
+from league_core.perf import count
+
+LOGO_FILES = ("league_logo.jpg", "league_logo.png")
+LOGO_WIDTH = 320   # the logo column in the wide layout, at 2x for HiDPI screens
+
+_MIME = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+_EXT = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+
+class Asset(NamedTuple):
+    data: bytes
+    mime: str
+    sha256: str
+    stem: str
+    ext: str
+
+    @property
+    def filename(self) -> str:
+        """Content-addressed name, e.g. ``league_logo.3f2a9c1d04be.jpg``."""
+        return f"{self.stem}.{self.sha256[:12]}.{self.ext}"
+
+
+_decoded = {}     # path -> ((mtime, size), decoded image)
+_variants = {}    # (path, (mtime, size), width, fmt, quality) -> Asset
+_lock = threading.Lock()
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _decode(path, stamp):
+    hit = _decoded.get(path)
+    if hit and hit[0] == stamp:
+        return hit[1]
+    from PIL import Image
+
+    with Image.open(path) as im:
+        im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+    _decoded[path] = (stamp, im)
+    return im
+
+
+def _encode(im, width, fmt, quality) -> bytes:
+    import io
+
+    from PIL import Image
+
+    if width and im.width > width:
+        im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+    if fmt == "JPEG" and im.mode != "RGB":
+        im = im.convert("RGB")
+    buf = io.BytesIO()
+    opts = {"JPEG": {"quality": quality, "optimize": True, "progressive": True},
+            "WEBP": {"quality": quality, "method": 6},
+            "PNG": {"optimize": True}}[fmt]
+    im.save(buf, format=fmt, **opts)
+    return buf.getvalue()
+
+
+def image_variant(path: str, width: int = LOGO_WIDTH, fmt: str = "JPEG", quality: int = 85) -> Asset:
+    """``path`` scaled down to at most ``width`` pixels and re-encoded as
+    ``fmt`` (JPEG, WEBP or PNG), built once per source file version."""
+    fmt = fmt.upper()
+    stamp = _stamp(path)
+    key = (path, stamp, width, fmt, quality)
+    asset = _variants.get(key)
+    count("assets.hit" if asset is not None else "assets.miss")
+    if asset is not None:
+        return asset
+    stem = os.path.splitext(os.path.basename(path))[0]
+    with _lock:
+        asset = _variants.get(key)
+        if asset is None:
+            try:
+                data = _encode(_decode(path, stamp), width, fmt, quality)
+                mime, ext = _MIME[fmt], _EXT[fmt]
+            except ImportError:
+                with open(path, "rb") as f:
+                    data = f.read()
+                mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                ext = os.path.splitext(path)[1].lstrip(".")
+            asset = _variants[key] = Asset(data, mime, hashlib.sha256(data).hexdigest(), stem, ext)
+    return asset
+
+
+def logo(width: int = LOGO_WIDTH, fmt: str = "JPEG"):
+    """The first logo file that exists, as a cached variant; None if none do."""
+    for path in LOGO_FILES:
+        if os.path.exists(path):
+            try:
+                return image_variant(path, width, fmt)
+            except Exception:
+                continue
+    return None
+
+
+def show_logo(st):
+    # Takes the streamlit module so league_core never imports it. Do not
+    # ship/overwrite the user's logo; show it if present.
+    asset = logo()
+    if asset is None:
+        st.markdown("### League")
+        return
+    st.image(asset.data, use_column_width=True)
@@ -0,0 +1,22 @@
+"""Loose column matching shared by the tracker readers."""
+import re
+
+
+def norm(c) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(c).lower())
+
+
+def colmap(df) -> dict:
+    return {norm(c): c for c in df.columns}
+
+
+def pick(cols: dict, *names):
+    for n in names:
+        if cols.get(n):
+            return cols[n]
+    return None
+
+
+def is_event_sheet(name) -> bool:
+    nm = str(name).lower()
+    return nm.startswith("event_") and nm.endswith("_standings")
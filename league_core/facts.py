@@ -0,0 +1,163 @@
+"""Long-format "event facts" table built once per workbook version.
+
+``event_facts`` matches the columns of every ``Event_N_Standings`` sheet and
+converts them once per workbook version, returning one row per player per
+event:
+
+    Event (Int64), Sheet (str), Player (category), Place (Int64),
+    KOs (int64), Payout (float64)
+
+Place is NA when a sheet has no place column (the leaderboard skips those
+rows) and Payout is NaN when it has no payout column (the finance table
+skips those sheets). ``event_tables`` gives the per-event views as the
+Nightly Payouts and Bounties tabs show them, numbering unplaced sheets in
+row order.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from league_core.columns import colmap, is_event_sheet, pick
+from league_core.lru import LRU
+from league_core.money import parse_money_series
+from league_core.perf import timed
+
+FACT_COLUMNS = ["Event", "Sheet", "Player", "Place", "KOs", "Payout"]
+
+_EVENT_NO = re.compile(r'^event_(\d+)_standings$', re.I)
+
+
+def event_number(name):
+    m = _EVENT_NO.match(str(name))
+    return int(m.group(1)) if m else None
+
+
+def event_sort_key(name):
+    """Numeric event order (Event_2 before Event_10); unnumbered sheets last."""
+    n = event_number(name)
+    return (n is None, n or 0, str(name))
+
+
+def _sheet_facts(name, df: pd.DataFrame):
+    cols = colmap(df)
+    pcol = pick(cols, "player", "name")
+    if not pcol:
+        return None
+    place_col = pick(cols, "place", "rank", "finish", "position")
+    payout_col = pick(cols, "payout", "payoutamount")
+    kos_col = pick(cols, "kos", "knockouts", "eliminations", "elims", "numeliminated", "eliminated")
+    n = len(df)
+    t = pd.DataFrame(index=range(n))
+    t["Event"] = pd.array([event_number(name)] * n, dtype="Int64")
+    t["Sheet"] = str(name)
+    t["Player"] = df[pcol].astype(str).str.strip().to_numpy()
+    if place_col:
+        t["Place"] = pd.to_numeric(df[place_col], errors="coerce").astype("Int64").array
+    else:
+        t["Place"] = pd.array([pd.NA] * n, dtype="Int64")
+    t["KOs"] = pd.to_numeric(df[kos_col], errors="coerce").fillna(0).astype(int).to_numpy() if kos_col else 0
+    t["Payout"] = parse_money_series(df[payout_col]).to_numpy() if payout_col else np.nan
+    return t
+
+
+@timed("facts.build")
+def build_event_facts(sheet_map: dict) -> pd.DataFrame:
+    frames = []
+    for name in [k for k in (sheet_map or {}) if is_event_sheet(k)]:
+        df = sheet_map[name]
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            continue
+        t = _sheet_facts(name, df)
+        if t is not None:
+            frames.append(t)
+    if not frames:
+        facts = pd.DataFrame({
+            "Event": pd.array([], dtype="Int64"), "Sheet": pd.Series([], dtype=str),
+            "Player": pd.Categorical([]), "Place": pd.array([], dtype="Int64"),
+            "KOs": pd.Series([], dtype=int), "Payout": pd.Series([], dtype=float),
+        })
+        return facts
+    facts = pd.concat(frames, ignore_index=True)
+    facts["Player"] = facts["Player"].astype("category")
+    facts["Place"] = facts["Place"].astype("Int64")
+    facts["KOs"] = facts["KOs"].astype(int)
+    facts["Payout"] = facts["Payout"].astype(float)
+    return facts[FACT_COLUMNS]
+
+
+class _FactsCache:
+    # Keyed on the identity of the event-sheet frames; the entry keeps those
+    # frames alive so an id() can't be recycled while it is cached.
+    def __init__(self, maxsize=8):
+        self._entries = LRU(maxsize, "facts_cache")
+
+    def get(self, sheet_map: dict) -> dict:
+        frames = tuple((str(k), sheet_map[k]) for k in (sheet_map or {}) if is_event_sheet(k))
+        frames = tuple((k, v) for k, v in frames if isinstance(v, pd.DataFrame))
+        key = tuple((k, id(v)) for k, v in frames)
+        return self._entries.get_or_build(key, lambda: self._build(frames))
+
+    @staticmethod
+    def _build(frames):
+        facts = build_event_facts(dict(frames))
+        groups = {s: g.reset_index(drop=True) for s, g in facts.groupby("Sheet", sort=False)}
+        return {"frames": frames, "facts": facts,
+                "views": {s: groups[s] for s in sorted(groups, key=event_sort_key)}}
+
+    def clear(self):
+        self._entries.clear()
+
+
+_FACTS_CACHE = _FactsCache()
+clear_facts_cache = _FACTS_CACHE.clear
+
+
+def event_facts(sheet_map: dict) -> pd.DataFrame:
+    """Cached ``build_event_facts``; treat the returned frame as read-only."""
+    return _FACTS_CACHE.get(sheet_map)["facts"]
+
+
+def event_views(sheet_map: dict) -> dict:
+    """``{sheet name: that event's fact rows}`` in event-number order, cached
+    alongside the facts so repeated calls return the same frames."""
+    return _FACTS_CACHE.get(sheet_map)["views"]
+
+
+def event_tables(sheet_map: dict) -> dict:
+    """``event_views`` with Place numbered in row order for sheets that have
+    no place column, as the Nightly Payouts and Bounties tabs list them."""
+    entry = _FACTS_CACHE.get(sheet_map)
+    tables = entry.get("tables")
+    if tables is None:
+        frames = dict(entry["frames"])
+        tables = {}
+        for s, view in entry["views"].items():
+            if not pick(colmap(frames[s]), "place", "rank", "finish", "position"):
+                view = view.assign(Place=pd.array(range(1, len(view)+1), dtype="Int64"))
+            tables[s] = view
+        entry["tables"] = tables
+    return tables
+
+
+def player_index(sheet_map: dict) -> dict:
+    """``{player: row positions in event_facts}``, built once per facts
+    version so a player's history is a lookup instead of a season scan."""
+    entry = _FACTS_CACHE.get(sheet_map)
+    index = entry.get("players")
+    if index is None:
+        facts = entry["facts"]
+        codes = facts["Player"].cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(facts["Player"].cat.categories) + 1))
+        index = entry["players"] = {
+            p: order[bounds[i]:bounds[i+1]] for i, p in enumerate(facts["Player"].cat.categories)
+            if bounds[i] < bounds[i+1]}
+    return index
+
+
+def player_history(sheet_map: dict, player) -> pd.DataFrame:
+    """One player's fact rows in event order (empty if they never played)."""
+    rows = player_index(sheet_map).get(player, np.array([], dtype=np.intp))
+    hist = event_facts(sheet_map).iloc[rows]
+    return hist.sort_values("Event", kind="stable", na_position="last").reset_index(drop=True)
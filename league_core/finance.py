@@ -0,0 +1,121 @@
+"""Per-player season finances (Player Finances tab).
+
+``build_financials`` computes the whole table. ``financials`` and
+``player_finances`` go through a materialized view of it: the table plus a
+player index, rebuilt only when the fingerprint of one of its inputs (the
+event standings sheets, Players or Series_BuyIns) changes.
+"""
+import threading
+
+import pandas as pd
+
+from league_core.columns import is_event_sheet
+from league_core.facts import event_facts
+from league_core.lru import LRU
+from league_core.perf import timed
+from league_core.workbook import frame_fingerprint
+
+FINANCE_COLUMNS = ["Player","Events Played","Initial Buy-Ins Paid","Nightly Fees Paid","Bounty Contributions Paid","Nightly Payouts Earned","Bounties Earned","Total Paid In","Total Earned","Net Winnings"]
+FINANCE_SHEETS = ("Players", "Series_BuyIns")
+
+
+@timed("finance.build")
+def build_financials(sheet_map):
+    facts = event_facts(sheet_map)
+    facts = facts[facts["Payout"].notna()]   # sheets without a payout column don't count
+    all_rows = pd.DataFrame({
+        "Player": facts["Player"].astype(str),
+        "Payout_Amount": facts["Payout"],
+        "BountyEarned": facts["KOs"] * 5,
+    })
+    players_df = sheet_map.get("Players", pd.DataFrame(columns=["Player"]))
+    base = players_df[["Player"]].dropna().drop_duplicates().copy() if not players_df.empty else pd.DataFrame(columns=["Player"])
+    out = base.merge(all_rows.groupby("Player").size().rename("Events Played"), left_on="Player", right_index=True, how="left")
+    out = out.merge(all_rows.groupby("Player")["Payout_Amount"].sum().rename("Nightly Payouts Earned"), left_on="Player", right_index=True, how="left")
+    out = out.merge(all_rows.groupby("Player")["BountyEarned"].sum().rename("Bounties Earned"), left_on="Player", right_index=True, how="left")
+    out["Events Played"] = out["Events Played"].fillna(0).astype(int)
+    out["Nightly Fees Paid"] = out["Events Played"] * 55.0
+    out["Bounty Contributions Paid"] = out["Events Played"] * 5.0
+    buyins = sheet_map.get("Series_BuyIns", pd.DataFrame(columns=["Player","Amount"])).copy()
+    if not buyins.empty:
+        initial_buyins_paid = buyins.groupby("Player")["Amount"].sum().rename("Initial Buy-Ins Paid").to_frame()
+        out = out.merge(initial_buyins_paid, left_on="Player", right_index=True, how="left")
+    else:
+        out["Initial Buy-Ins Paid"] = 0.0
+    for col in ["Nightly Payouts Earned","Bounties Earned","Initial Buy-Ins Paid"]:
+        if col not in out.columns: out[col]=0.0
+        out[col] = out[col].fillna(0.0)
+    out["Total Paid In"] = out["Initial Buy-Ins Paid"] + out["Nightly Fees Paid"]
+    out["Total Earned"] = out["Nightly Payouts Earned"] + out["Bounties Earned"]
+    out["Net Winnings"] = out["Total Earned"] - out["Total Paid In"]
+    return out[FINANCE_COLUMNS].sort_values(["Net Winnings","Total Earned"], ascending=[False,False]).reset_index(drop=True)
+
+
+def finance_inputs(sheet_map) -> tuple:
+    """``(sheet, fingerprint)`` for every sheet the finance table reads."""
+    names = [k for k in (sheet_map or {}) if is_event_sheet(k) or k in FINANCE_SHEETS]
+    return tuple((str(k), frame_fingerprint(sheet_map[k])) for k in names
+                 if isinstance(sheet_map[k], pd.DataFrame))
+
+
+def _player_row(sheet_map, player):
+    """One player's finance row computed from their own rows only."""
+    players_df = sheet_map.get("Players", pd.DataFrame(columns=["Player"]))
+    if players_df.empty or not (players_df["Player"] == player).any():
+        return None
+    facts = event_facts(sheet_map)
+    mine = facts[(facts["Player"] == str(player)) & facts["Payout"].notna()]
+    buyins = sheet_map.get("Series_BuyIns", pd.DataFrame(columns=["Player","Amount"]))
+    paid = float(buyins.loc[buyins["Player"] == player, "Amount"].sum()) if not buyins.empty else 0.0
+    n = len(mine)
+    row = {"Player": player, "Events Played": n, "Initial Buy-Ins Paid": paid,
+           "Nightly Fees Paid": n * 55.0, "Bounty Contributions Paid": n * 5.0,
+           "Nightly Payouts Earned": float(mine["Payout"].sum()),
+           "Bounties Earned": float(mine["KOs"].sum() * 5)}
+    row["Total Paid In"] = row["Initial Buy-Ins Paid"] + row["Nightly Fees Paid"]
+    row["Total Earned"] = row["Nightly Payouts Earned"] + row["Bounties Earned"]
+    row["Net Winnings"] = row["Total Earned"] - row["Total Paid In"]
+    return row
+
+
+class FinanceView:
+    """Bounded LRU of finance tables keyed by their input fingerprints, so
+    sessions looking at the same tracker share one build."""
+
+    def __init__(self, maxsize: int = 4):
+        self.maxsize = maxsize
+        self.builds = 0
+        self._entries = LRU(maxsize, "finance_view")
+        self._lock = threading.Lock()
+
+    def table(self, sheet_map) -> pd.DataFrame:
+        key = finance_inputs(sheet_map)
+        entry = self._entries.get(key)
+        if entry is None:
+            table = build_financials(sheet_map)
+            entry = {"table": table,
+                     "index": {p: i for i, p in reversed(list(enumerate(table["Player"])))}}
+            with self._lock:
+                self.builds += 1
+            self._entries.put(key, entry)
+        return entry["table"]
+
+    def player(self, sheet_map, player):
+        """``{column: value}`` for one player, or None if they are not on
+        the Players sheet. Uses the built view when it is current and
+        otherwise computes just that player's row."""
+        entry = self._entries.get(finance_inputs(sheet_map))
+        if entry is None:
+            return _player_row(sheet_map, player)
+        i = entry["index"].get(player)
+        return None if i is None else entry["table"].iloc[i].to_dict()
+
+    def clear(self):
+        self._entries.clear()
+        with self._lock:
+            self.builds = 0
+
+
+FINANCE_VIEW = FinanceView()
+financials = FINANCE_VIEW.table
+player_finances = FINANCE_VIEW.player
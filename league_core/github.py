@@ -0,0 +1,127 @@
+"""Conditional fetches of the tracker from the GitHub contents API.
+
+Each fetch sends ``If-None-Match`` with the ETag from the previous response
+for the same repo/path/ref. A 304 (or a 200 whose blob SHA is unchanged)
+reuses the cached bytes, and the parse is served by ``WORKBOOK_CACHE``; only
+a changed file is decoded and parsed. All fetches share one pooled
+``requests.Session`` per process.
+"""
+import base64
+import hashlib
+import threading
+
+from league_core.perf import timed
+from league_core.workbook import WORKBOOK_CACHE
+
+API_BASE = "https://api.github.com"
+
+_session = None
+_session_lock = threading.Lock()
+_etags = {}  # (api_base, owner_repo, path, ref) -> {"etag", "sha", "bytes"}
+
+
+def git_blob_sha(data: bytes) -> str:
+    """The SHA GitHub reports for a file with these bytes."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            _session = requests.Session()
+            _session.headers["Accept"] = "application/vnd.github+json"
+        return _session
+
+
+def _headers(token):
+    return {"Authorization": f"token {token}"} if token else {}
+
+
+def contents_url(owner_repo, path="tracker.xlsx", api_base=API_BASE):
+    return f"{api_base.rstrip('/')}/repos/{owner_repo}/contents/{path}"
+
+
+def fetch_bytes(owner_repo, branch, token="", path="tracker.xlsx", api_base=API_BASE, timeout=20):
+    """Return ``(bytes, info)``; ``info["cached"]`` is True when the previous
+    download was reused (304 or same blob SHA)."""
+    key = (api_base, owner_repo, path, branch)
+    seen = _etags.get(key)
+    headers = _headers(token)
+    if seen and seen.get("etag"):
+        headers["If-None-Match"] = seen["etag"]
+    r = session().get(contents_url(owner_repo, path, api_base), headers=headers,
+                      params={"ref": branch}, timeout=timeout)
+    if r.status_code == 304 and seen:
+        return seen["bytes"], {"cached": True, "status": 304, "sha": seen["sha"]}
+    r.raise_for_status()
+    meta = r.json()
+    sha = meta.get("sha")
+    if seen and sha and sha == seen["sha"]:
+        data = seen["bytes"]
+        cached = True
+    elif meta.get("content"):
+        data = base64.b64decode(meta["content"])
+        cached = False
+    else:
+        # Files over 1 MB come back without inline content.
+        raw = session().get(meta["download_url"], headers=_headers(token), timeout=timeout)
+        raw.raise_for_status()
+        data = raw.content
+        cached = False
+    _etags[key] = {"etag": r.headers.get("ETag"), "sha": sha, "bytes": data}
+    return data, {"cached": cached, "status": r.status_code, "sha": sha}
+
+
+@timed("github.fetch")
+def fetch_tracker(owner_repo, branch, token="", path="tracker.xlsx", api_base=API_BASE, timeout=20):
+    """Sheet map for the tracker on GitHub plus the fetch info."""
+    data, info = fetch_bytes(owner_repo, branch, token, path, api_base, timeout)
+    return WORKBOOK_CACHE.read_bytes(data), info
+
+
+class PublishConflict(Exception):
+    """The file changed on GitHub since its SHA was read."""
+
+
+@timed("github.publish")
+def publish_tracker(owner_repo, branch, token, data: bytes, base_sha, path="tracker.xlsx",
+                    message="Update tracker", api_base=API_BASE, timeout=30):
+    """Commit ``data`` to ``path`` unless GitHub already has those exact bytes.
+
+    ``base_sha`` is the blob SHA of the tracker the edits started from:
+    ``git_blob_sha`` of the uploaded or local bytes, or ``info["sha"]`` from
+    ``fetch_bytes`` (None for a file that doesn't exist yet). If GitHub's copy
+    is no longer that blob, ``PublishConflict`` is raised instead of
+    overwriting it; the PUT also carries ``base_sha``, so an edit landing
+    between the check and the write is rejected by GitHub.
+    Returns ``{"skipped", "sha", "commit"}``.
+    """
+    new_sha = git_blob_sha(data)
+    key = (api_base, owner_repo, path, branch)
+    try:
+        _, info = fetch_bytes(owner_repo, branch, token, path, api_base, timeout)
+        remote = info["sha"]
+    except Exception as e:
+        if getattr(getattr(e, "response", None), "status_code", None) != 404:
+            raise
+        remote = None
+    if remote == new_sha:
+        return {"skipped": True, "sha": new_sha, "commit": None}
+    if remote != base_sha:
+        raise PublishConflict(f"{path} on GitHub is {(remote or 'missing')[:7]}, "
+                              f"edits started from {(base_sha or 'a new file')[:7]}")
+    body = {"message": message, "branch": branch,
+            "content": base64.b64encode(data).decode("ascii")}
+    if base_sha:
+        body["sha"] = base_sha
+    r = session().put(contents_url(owner_repo, path, api_base), headers=_headers(token),
+                      json=body, timeout=timeout)
+    if r.status_code in (409, 422):
+        raise PublishConflict(r.json().get("message", r.reason))
+    r.raise_for_status()
+    out = r.json()
+    sha = out["content"]["sha"]
+    _etags[key] = {"etag": None, "sha": sha, "bytes": data}
+    return {"skipped": False, "sha": sha, "commit": out["commit"]["sha"]}
@@ -0,0 +1,127 @@
+"""Local stand-in for the GitHub contents API, for offline runs.
+
+Serves ``GET /repos/<owner>/<repo>/contents/<path>?ref=<branch>`` with blob
+SHAs, ETags and ``304 Not Modified`` like the real API, and ``PUT`` to the
+same path with its SHA check (409 on a stale SHA, 422 when one is missing
+for an existing file). An optional per-request delay models network
+latency::
+
+    with GitHubStub({("me/league", "tracker.xlsx", "main"): data}, latency=0.05) as gh:
+        fetch_tracker("me/league", "main", api_base=gh.base_url)
+        gh.stats  # {"requests": 1, "not_modified": 0, "writes": 0}
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from league_core.github import git_blob_sha
+
+
+class GitHubStub:
+    def __init__(self, files=None, latency: float = 0.0, default_ref: str = "main"):
+        self.files = dict(files or {})
+        self.latency = latency
+        self.default_ref = default_ref
+        self.stats = {"requests": 0, "not_modified": 0, "writes": 0}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(code)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                if body is not None:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _target(self):
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/", 4)
+                if len(parts) < 5 or parts[0] != "repos" or parts[3] != "contents":
+                    return None
+                ref = parse_qs(url.query).get("ref", [stub.default_ref])[0]
+                return (f"{parts[1]}/{parts[2]}", parts[4], ref)
+
+            def do_GET(self):
+                stub._count("requests")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                key = self._target()
+                data = stub.files.get(key) if key else None
+                if data is None:
+                    return self._send(404, {"message": "Not Found"})
+                sha = git_blob_sha(data)
+                etag = f'W/"{sha}"'
+                if self.headers.get("If-None-Match") == etag:
+                    stub._count("not_modified")
+                    return self._send(304, headers={"ETag": etag})
+                b64 = base64.encodebytes(data).decode()
+                self._send(200, {"name": key[1].rsplit("/", 1)[-1], "path": key[1], "sha": sha,
+                                 "size": len(data), "encoding": "base64", "content": b64},
+                           headers={"ETag": etag})
+
+            def do_PUT(self):
+                stub._count("requests")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/", 4)
+                if len(parts) < 5 or parts[0] != "repos" or parts[3] != "contents":
+                    return self._send(404, {"message": "Not Found"})
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                key = (f"{parts[1]}/{parts[2]}", parts[4], body.get("branch", stub.default_ref))
+                with stub._lock:
+                    current = stub.files.get(key)
+                    if current is not None and "sha" not in body:
+                        return self._send(422, {"message": "Invalid request. \"sha\" wasn't supplied."})
+                    if current is not None and body["sha"] != git_blob_sha(current):
+                        return self._send(409, {"message": f"{key[1]} does not match {body['sha']}"})
+                    data = base64.b64decode(body["content"])
+                    stub.files[key] = data
+                    stub.stats["writes"] += 1
+                sha = git_blob_sha(data)
+                commit = hashlib.sha1(f"{key}{sha}{stub.stats['writes']}".encode()).hexdigest()
+                self._send(201 if current is None else 200,
+                           {"content": {"path": key[1], "sha": sha}, "commit": {"sha": commit}})
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,127 @@
+"""Applying parsed timer logs to the tracker sheets, one event or a batch.
+
+``apply_event`` is the admin ingest: it numbers the event after the last
+``Event_N_Standings`` sheet, adds new players, posts the pool accruals and
+nightly payout, adds the server tip and stores the standings sheet.
+
+``ingest_batch`` parses many timer logs (in a process pool when the batch
+is large), then records them in order in one ``LeagueStore`` that is
+flushed once. Nothing is returned for commit unless every file parsed, so a
+batch lands all at once or not at all, with exactly the ledger sequential
+uploads would have produced.
+"""
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+from league_core.perf import timed
+from league_core.store import LeagueStore
+from league_core.timer_log import read_timer_log
+
+# Starting spawned workers costs a second or more; parsing runs at roughly
+# 3 MB/s, so smaller batches are parsed in-process.
+POOL_MIN_BYTES = 8 * 1024 * 1024
+
+LOG_SUFFIXES = (".html", ".htm", ".csv", ".txt")
+
+
+def record_event(store: LeagueStore, standings: pd.DataFrame, players_list: list) -> int:
+    """Record one event in ``store`` and return its event number."""
+    ev_next = store.next_event_number()
+    d = store.event_date(ev_next)
+    e_date = str(d) if d is not None else str(date.today())
+
+    for p in players_list:
+        store.add_player(p, True)
+
+    # Pools ledger accruals & nightly payout
+    n_players = len(players_list)
+    store.post(e_date, ev_next, "Accrual","WSOP",      3*n_players,  "", "WSOP addl funding ($3 x players)")
+    store.post(e_date, ev_next, "Accrual","Nightly",  45*n_players, "", "Nightly payout funding ($45 x players)")
+    store.post(e_date, ev_next, "Accrual","Bounty",    5*n_players, "", "Bounty pool funding ($5 x players)")
+    store.post(e_date, ev_next, "Accrual","High Hand", 2*n_players, "", "High hand funding ($2 x players)")
+    store.post(e_date, ev_next, "Payout","Nightly",    float(standings["Payout_Amount"].sum()), "Yes", "Paid out on event night based on finish order")
+
+    store.add_supply(ev_next, e_date, "Server Tip", 100.00, "Auto-added")
+    store.set_standings(ev_next, standings)
+    return ev_next
+
+
+@timed("ingest.apply_event")
+def apply_event(sheet_map, standings: pd.DataFrame, players_list: list) -> int:
+    """Record one event directly in ``sheet_map`` (replacing, never
+    mutating, the affected sheets) and return its event number."""
+    store = LeagueStore(sheet_map)
+    ev = record_event(store, standings, players_list)
+    store.flush()
+    return ev
+
+
+def _natural_key(name):
+    return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', str(name))]
+
+
+def read_log_folder(path: str):
+    """``[(file name, bytes)]`` for every timer log in a folder."""
+    out = []
+    for fname in sorted(os.listdir(path), key=_natural_key):
+        if fname.lower().endswith(LOG_SUFFIXES):
+            with open(os.path.join(path, fname), "rb") as f:
+                out.append((fname, f.read()))
+    return out
+
+
+def _parse_one(args):
+    name, raw, points = args
+    t = time.perf_counter()
+    try:
+        standings, players = read_timer_log(raw, points)
+        return {"file": name, "standings": standings, "players": players,
+                "seconds": time.perf_counter() - t, "error": None}
+    except Exception as e:
+        return {"file": name, "standings": None, "players": None,
+                "seconds": time.perf_counter() - t, "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_logs(files, points: dict, max_workers=None) -> list:
+    """Parse ``[(name, bytes)]`` timer logs, in parallel processes when there
+    are at least ``POOL_MIN_BYTES`` of them; results come back in input order."""
+    jobs = [(name, raw, points) for name, raw in files]
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1 or sum(len(raw) for _, raw in files) < POOL_MIN_BYTES:
+        return [_parse_one(j) for j in jobs]
+    # spawn, not fork: forking the multithreaded Streamlit server can copy
+    # a lock some other thread holds into the child and deadlock it
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_parse_one, jobs))
+
+
+@timed("ingest.batch")
+def ingest_batch(sheet_map, files, points: dict, max_workers=None, sort=True):
+    """Parse and apply many timer logs as one operation.
+
+    ``files`` is ``[(name, bytes)]``, applied in natural file-name order
+    (``event2`` before ``event10``) unless ``sort`` is False. Returns
+    ``(changes, report)``: ``changes`` maps sheet name to its new frame (None
+    if any file failed, in which case nothing should be applied) and
+    ``report`` has one entry per file with parse seconds, assigned event
+    number and error, plus the total wall time.
+    """
+    t = time.perf_counter()
+    if sort:
+        files = sorted(files, key=lambda f: _natural_key(f[0]))
+    results = parse_logs(files, points, max_workers)
+    report = {"files": [{k: r[k] for k in ("file", "seconds", "error")} for r in results]}
+    changes = None
+    if not any(r["error"] for r in results):
+        store = LeagueStore(sheet_map)
+        for r, entry in zip(results, report["files"]):
+            entry["event"] = record_event(store, r["standings"], r["players"])
+        changes = store.changes()
+    report["seconds"] = time.perf_counter() - t
+    return changes, report
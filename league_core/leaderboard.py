@@ -0,0 +1,112 @@
+"""Incremental season leaderboard.
+
+``LeaderboardAggregator`` keeps per-player running totals (points, KOs,
+events played) and a ranking that is updated one ``Event_N_Standings``
+sheet at a time, so adding an event costs O(players in event) and reading
+an unchanged leaderboard returns the previously built frame. Rows without
+a place don't count.
+"""
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+from league_core.columns import colmap, is_event_sheet, pick
+from league_core.perf import timed
+
+LEADERBOARD_COLUMNS = ["Player", "Total_Points", "Total_KOs", "Events_Played"]
+
+
+def normalize_standings(df: pd.DataFrame, points: dict) -> pd.DataFrame:
+    """Player/Place/KOs/Points rows for one event; None if the sheet has no
+    player or place column."""
+    if df is None or df.empty:
+        return None
+    key = colmap(df)
+    pcol = pick(key, "player", "name")
+    plcol = pick(key, "place", "rank", "finish", "position")
+    kcol = pick(key, "kos", "knockouts", "eliminations", "elims", "numeliminated", "eliminated")
+    if not (pcol and plcol):
+        return None
+    t = pd.DataFrame({
+        "Player": df[pcol].astype(str).str.strip(),
+        "Place": pd.to_numeric(df[plcol], errors="coerce")
+    })
+    t["KOs"] = pd.to_numeric(df[kcol], errors="coerce").fillna(0).astype(int) if kcol else 0
+    t = t.dropna(subset=["Place"])
+    t["Points"] = t["Place"].map(points).fillna(0)
+    return t
+
+
+class LeaderboardAggregator:
+    def __init__(self, points: dict):
+        self.points = points
+        self._totals = {}      # player -> [points, kos, events]
+        self._ranking = []     # sorted (-points, -kos, player)
+        self._events = {}      # event key -> (source frame, contribution rows)
+        self._frame = None
+
+    def _rank_key(self, player):
+        pts, kos, _ = self._totals[player]
+        return (-pts, -kos, player)
+
+    def _apply(self, rows, sign):
+        for player, pts, kos in rows:
+            tot = self._totals.get(player)
+            if tot is not None:
+                i = bisect_left(self._ranking, self._rank_key(player))
+                del self._ranking[i]
+            else:
+                tot = self._totals[player] = [0.0, 0, 0]
+            tot[0] += sign * pts
+            tot[1] += sign * kos
+            tot[2] += sign
+            if tot[2] <= 0:
+                del self._totals[player]
+            else:
+                insort(self._ranking, self._rank_key(player))
+        self._frame = None
+
+    def add_event(self, key, standings: pd.DataFrame):
+        """Fold one event's standings into the totals, replacing any earlier
+        version of the same event key."""
+        if key in self._events:
+            self.remove_event(key)
+        t = normalize_standings(standings, self.points)
+        rows = [] if t is None else list(zip(t["Player"], t["Points"].astype(float), t["KOs"].astype(int)))
+        self._events[key] = (standings, rows)
+        self._apply(rows, 1)
+        return self
+
+    def remove_event(self, key):
+        _, rows = self._events.pop(key)
+        self._apply(rows, -1)
+        return self
+
+    @timed("leaderboard.sync")
+    def sync(self, sheet_map: dict):
+        """Bring the totals in line with the event sheets in ``sheet_map``.
+
+        Sheets are matched by name and frame identity, so a cached sheet map
+        that has not changed costs one pass over its keys."""
+        current = {name: sheet_map[name] for name in (sheet_map or {}) if is_event_sheet(name)}
+        current = {name: df for name, df in current.items() if isinstance(df, pd.DataFrame)}
+        for key in [k for k in self._events if k not in current]:
+            self.remove_event(key)
+        for name, df in current.items():
+            seen = self._events.get(name)
+            if seen is None or seen[0] is not df:
+                self.add_event(name, df)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            players = [k[2] for k in self._ranking]
+            g = pd.DataFrame({
+                "Player": players,
+                "Total_Points": [self._totals[p][0] for p in players],
+                "Total_KOs": [self._totals[p][1] for p in players],
+                "Events_Played": [self._totals[p][2] for p in players],
+            }, columns=LEADERBOARD_COLUMNS)
+            g.index = g.index + 1
+            self._frame = g
+        return self._frame
@@ -0,0 +1,26 @@
+"""League rules and tracker loading, shared by both apps and headless scripts.
+
+Loading goes through the process-wide ``WORKBOOK_CACHE``, so every session
+(and any script in the same process) shares one parsed copy per tracker.
+"""
+from league_core.workbook import WORKBOOK_CACHE
+
+POINTS = {1:14,2:11,3:9,4:7,5:5,6:4,7:3,8:2,9:1,10:0.5}
+TRACKER_PATH = "tracker.xlsx"
+KPI_POOLS = ("wsop", "bounty", "high hand", "nightly")
+
+
+def read_tracker_bytes(b: bytes):
+    return WORKBOOK_CACHE.read_bytes(b)
+
+
+def read_local_tracker(path: str = TRACKER_PATH):
+    try:
+        return WORKBOOK_CACHE.read_path(path)
+    except Exception:
+        return None
+
+
+def kpi_totals(balances: dict) -> tuple:
+    """(wsop, bounty, high hand, nightly) balances for the KPI strip."""
+    return tuple(balances.get(p, 0.0) for p in KPI_POOLS)
@@ -0,0 +1,49 @@
+"""Bounded least-recently-used map shared by the process-wide caches.
+
+Lookups and inserts take a lock, so sessions can share one cache; builds
+passed to ``get_or_build`` run outside it (two sessions missing at once may
+both build, and the later result is kept).
+"""
+import threading
+from collections import OrderedDict
+
+from league_core.perf import count
+
+
+class LRU:
+    def __init__(self, maxsize: int, name: str = None):
+        self.maxsize = maxsize
+        self.name = name          # counts "<name>.hit" / "<name>.miss" when set
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, default)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                hit = True
+            else:
+                hit = False
+        if self.name:
+            count(f"{self.name}.hit" if hit else f"{self.name}.miss")
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_or_build(self, key, build):
+        value = self.get(key)
+        return self.put(key, build()) if value is None else value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,79 @@
+"""Money parsing for tracker cells ("$1,200", "(45.00)", blanks)."""
+import numpy as np
+import pandas as pd
+
+
+def parse_money(x):
+    if pd.isna(x): return 0.0
+    if isinstance(x,(int,float)): return float(x)
+    s = str(x).replace("$","").replace(",","").strip()
+    neg = False
+    if s.startswith("(") and s.endswith(")"):
+        neg = True; s = s[1:-1]
+    try:
+        v = float(s)
+        return -v if neg else v
+    except:
+        return 0.0
+
+
+# Only shapes float() and Arrow's parser agree on; everything else goes
+# through parse_money so edge cases keep the scalar semantics.
+_PLAIN_NUMBER = r'^-?(?:\d+\.?\d*|\.\d+)$'
+
+
+def _parse_money_strings(txt: np.ndarray) -> np.ndarray:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    t = pa.array(txt, type=pa.string())
+    t = pc.replace_substring(t, "$", "")
+    t = pc.replace_substring(t, ",", "")
+    t = pc.ascii_trim(t, " \t\n\r\x0b\x0c")
+    neg = pc.and_(pc.starts_with(t, "("), pc.ends_with(t, ")"))
+    t = pc.if_else(neg, pc.utf8_slice_codeunits(t, 1, -1), t)
+    plain = pc.match_substring_regex(t, _PLAIN_NUMBER)
+    amt = pc.cast(pc.if_else(plain, t, None), pa.float64()).to_numpy(zero_copy_only=False)
+    plain = plain.to_numpy(zero_copy_only=False)
+    neg = neg.to_numpy(zero_copy_only=False) & plain
+    amt = np.where(plain, amt, 0.0)
+    amt[neg] = -amt[neg]
+    # float() only accepts digit-free text for nan/inf spellings, so the rest
+    # of the leftovers ("", "n/a", "TBD") are 0.0 without a Python call.
+    rest = np.flatnonzero(~plain)
+    if len(rest):
+        left = t.take(rest)
+        maybe = pc.or_(pc.match_substring_regex(left, r'\p{Nd}'),
+                       pc.match_substring_regex(left, "nan|inf", ignore_case=True))
+        odd = rest[maybe.to_numpy(zero_copy_only=False)]
+        amt[odd] = [parse_money(x) for x in txt[odd]]
+    return amt
+
+
+def parse_money_series(values) -> pd.Series:
+    """Vectorized ``parse_money`` over a column; returns float64 with the same
+    index and exactly the values the per-cell version would give.
+
+    Strings are cleaned and converted with Arrow compute kernels; numbers are
+    cast in one step. Without pyarrow this falls back to ``apply``.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if s.dtype.kind in "biuf":
+        return s.astype(float).fillna(0.0)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return s.apply(parse_money).astype(float)
+    arr = s.to_numpy(dtype=object)
+    kinds = pd.Series(arr).map(type).to_numpy()
+    is_str = kinds == str
+    other = ~is_str & ~pd.isna(arr)
+    out = np.zeros(len(arr))
+    if other.any():
+        try:
+            out[other] = arr[other].astype(float)
+        except (TypeError, ValueError):
+            out[other] = [parse_money(x) for x in arr[other]]
+    if is_str.any():
+        out[is_str] = _parse_money_strings(arr[is_str])
+    return pd.Series(out, index=s.index)
@@ -0,0 +1,155 @@
+"""Lightweight timing spans for the apps' hot paths.
+
+Instrumented functions are wrapped with ``timed(name)`` (or a block with
+``span(name)``). While collection is off, the wrapper is a single flag
+check before calling through. Turn it on with ``LEAGUE_PERF=1`` in the
+environment or ``enable()`` (the admin app's sidebar toggle).
+
+Each span is recorded in the process-wide ``RECORDER`` (all sessions) and,
+when a Streamlit session has called ``bind()``, in that session's own
+recorder. Recorders keep the last ``window`` durations per span for
+p50/p95 and running call counts/totals, plus plain counters (cache hits and
+misses) bumped with ``count(name)``.
+"""
+import csv
+import functools
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+STAT_COLUMNS = ["span", "calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"]
+
+_enabled = os.environ.get("LEAGUE_PERF", "") not in ("", "0")
+_session = threading.local()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+class Recorder:
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._spans = {}      # name -> [calls, total_s, max_s, deque of recent durations]
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            s = self._spans.get(name)
+            if s is None:
+                s = self._spans[name] = [0, 0.0, 0.0, deque(maxlen=self.window)]
+            s[0] += 1
+            s[1] += seconds
+            s[2] = max(s[2], seconds)
+            s[3].append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def counters(self) -> dict:
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def stats(self) -> pd.DataFrame:
+        rows = []
+        with self._lock:
+            spans = {k: (v[0], v[1], v[2], sorted(v[3])) for k, v in self._spans.items()}
+        for name, (calls, total, worst, recent) in sorted(spans.items()):
+            def q(p):
+                return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000
+            rows.append([name, calls, total * 1000, total / calls * 1000, q(0.5), q(0.95), worst * 1000])
+        return pd.DataFrame(rows, columns=STAT_COLUMNS)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def to_json(self) -> str:
+        return json.dumps({"spans": self.stats().to_dict(orient="records"),
+                           "counters": self.counters()}, indent=1)
+
+    def to_csv(self) -> str:
+        buf = io.StringIO()
+        self.stats().to_csv(buf, index=False)
+        w = csv.writer(buf)
+        for name, n in self.counters().items():
+            w.writerow([f"counter:{name}", n])
+        return buf.getvalue()
+
+
+RECORDER = Recorder()
+
+
+def bind(recorder: Recorder):
+    """Also record this thread's spans (one Streamlit rerun) into ``recorder``."""
+    _session.recorder = recorder
+
+
+def _record(name, seconds):
+    RECORDER.add(name, seconds)
+    mine = getattr(_session, "recorder", None)
+    if mine is not None:
+        mine.add(name, seconds)
+
+
+def count(name, n=1):
+    if _enabled:
+        RECORDER.count(name, n)
+        mine = getattr(_session, "recorder", None)
+        if mine is not None:
+            mine.count(name, n)
+
+
+@contextmanager
+def span(name):
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - t0)
+
+
+def timed(name):
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+class Timer:
+    """Manual start/stop for spans that can't be a ``with`` block, like a
+    whole script rerun."""
+
+    def __init__(self, name):
+        self.name = name
+        self.t0 = time.perf_counter() if _enabled else None
+
+    def stop(self):
+        if self.t0 is not None:
+            _record(self.name, time.perf_counter() - self.t0)
+            self.t0 = None
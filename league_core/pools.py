@@ -0,0 +1,69 @@
+"""Pools_Ledger balances for every pool in one pass.
+
+The ledger is normalized once (column matching, money parsing, accrual and
+payout signs) and grouped by pool: ``pool_summary`` for the tables,
+``pool_balances`` for the KPI strips, ``pool_running_balances`` per event.
+Pool names are matched case-insensitively, so results are keyed by the
+stripped, lower-cased name ("wsop", "high hand", ...).
+"""
+import pandas as pd
+
+from league_core.columns import colmap, pick
+from league_core.money import parse_money_series
+from league_core.perf import timed
+
+SIGNS = {"accrual": 1, "payout": -1}
+
+
+def _ledger_rows(pools_df):
+    if pools_df is None or not isinstance(pools_df, pd.DataFrame) or pools_df.empty:
+        return None
+    cols = colmap(pools_df)
+    tcol = pick(cols, "type"); pcol = pick(cols, "pool")
+    acol = pick(cols, "amount", "amt", "value")
+    if not (tcol and pcol and acol):
+        return None
+    ecol = pick(cols, "event", "eventno", "eventnum", "eventnumber")
+    t = pd.DataFrame({
+        "Pool": pools_df[pcol].astype(str).str.strip().str.lower(),
+        "Amount": parse_money_series(pools_df[acol]),
+    })
+    t["Sign"] = pools_df[tcol].astype(str).str.strip().str.lower().map(SIGNS).fillna(1)
+    t["Net"] = t["Amount"] * t["Sign"]
+    t["Event #"] = pd.to_numeric(pools_df[ecol], errors="coerce") if ecol else pd.NA
+    return t
+
+
+@timed("pools.summary")
+def pool_summary(pools_df, split: bool = False) -> pd.DataFrame:
+    """Signed balance per pool; with ``split`` also Accrued and Paid Out
+    (rows that are neither count as accruals, like the balance does)."""
+    out_cols = ["Balance"] + (["Accrued", "Paid Out"] if split else [])
+    t = _ledger_rows(pools_df)
+    if t is None:
+        return pd.DataFrame(columns=out_cols, dtype=float)
+    if split:
+        t["Accrued"] = t["Amount"].where(t["Sign"] > 0, 0.0)
+        t["Paid Out"] = t["Amount"].where(t["Sign"] < 0, 0.0)
+        g = t.groupby("Pool")[["Net", "Accrued", "Paid Out"]].sum()
+    else:
+        g = t.groupby("Pool")[["Net"]].sum()
+    return g.rename(columns={"Net": "Balance"})[out_cols]
+
+
+def pool_balances(pools_df) -> dict:
+    """``{pool: balance}``; look up with ``.get(name.lower(), 0.0)``."""
+    return pool_summary(pools_df)["Balance"].astype(float).to_dict()
+
+
+@timed("pools.running")
+def pool_running_balances(pools_df) -> pd.DataFrame:
+    """Net change and running balance per pool after each event number."""
+    t = _ledger_rows(pools_df)
+    if t is None:
+        return pd.DataFrame(columns=["Pool", "Event #", "Net", "Balance"])
+    g = (t.groupby(["Pool", "Event #"], dropna=False, as_index=False)["Net"].sum()
+         .sort_values(["Pool", "Event #"], kind="stable", na_position="first")
+         .reset_index(drop=True))
+    g["Balance"] = g.groupby("Pool")["Net"].cumsum()
+    return g
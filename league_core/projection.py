@@ -0,0 +1,132 @@
+"""Monte Carlo projection of the rest of the season (WSOP seat odds).
+
+Each simulated season plays the remaining events on top of the current
+leaderboard totals, all seasons at once as ``(sims, players)`` arrays:
+
+* a player enters an event with the share of past events they played;
+* finishing order among the entrants is Plackett-Luce on the player's
+  average points per event, sampled as an exponential race; only the
+  scoring places are ordered;
+* knockouts are Poisson at the player's past KOs per event entered.
+
+Both per-event averages are shrunk toward the league average by two
+pseudo-events, so one big night doesn't dominate. Like the leaderboard,
+only rows with a place count; points come from the league points table,
+and final standings use the leaderboard ordering (points, then KOs, then
+name). Results are cached per
+standings version (event sheet fingerprints) and simulation parameters.
+"""
+import numpy as np
+import pandas as pd
+
+from league_core.columns import is_event_sheet
+from league_core.facts import event_facts, event_number
+from league_core.lru import LRU
+from league_core.perf import timed
+from league_core.workbook import frame_fingerprint
+
+SEATS = 5
+BOUNTY = 5.0
+PROJECTION_COLUMNS = ["Player", "Points", "KOs", "Events_Played", "P_Top5",
+                      "Expected_Points", "Expected_KOs", "Expected_Bounty"]
+
+
+def season_inputs(sheet_map: dict, points: dict) -> pd.DataFrame:
+    """Per-player totals and rates the simulation starts from."""
+    facts = event_facts(sheet_map)
+    facts = facts[facts["Place"].notna()]   # the leaderboard only counts placed rows
+    held = facts["Sheet"].nunique() or 1
+    f = pd.DataFrame({"Player": facts["Player"].astype(str),
+                      "Points": facts["Place"].map(points).astype(float).fillna(0.0),
+                      "KOs": facts["KOs"]})
+    g = f.groupby("Player", sort=True).agg(
+        Points=("Points", "sum"), KOs=("KOs", "sum"), Events_Played=("Player", "size"))
+    g["Attend"] = (g["Events_Played"] / held).clip(upper=1.0)
+    avg_points = f["Points"].mean() if len(f) else 0.0
+    avg_kos = f["KOs"].mean() if len(f) else 0.0
+    g["Strength"] = (g["Points"] + 2 * avg_points) / (g["Events_Played"] + 2) + 1.0
+    g["KO_Rate"] = (g["KOs"] + 2 * avg_kos) / (g["Events_Played"] + 2)
+    return g.reset_index()
+
+
+def remaining_events(sheet_map: dict) -> int:
+    """Scheduled events (Events sheet) after the last one with standings."""
+    played = [event_number(k) for k in (sheet_map or {}) if is_event_sheet(k)]
+    last = max([n for n in played if n is not None], default=0)
+    ev = (sheet_map or {}).get("Events")
+    if not isinstance(ev, pd.DataFrame) or "Event #" not in ev:
+        return 0
+    nums = pd.to_numeric(ev["Event #"], errors="coerce")
+    return int((nums > last).sum())
+
+
+def simulate(points_now, kos_now, attend, strength, ko_rate, points: dict, remaining: int,
+             sims: int = 20000, seats: int = SEATS, seed: int = 0, chunk: int = 5000):
+    """Vectorized season simulation; arrays are per player, already in name
+    order (the final tiebreak). Returns (P(top seats), E[points], E[KOs])."""
+    rng = np.random.default_rng(seed)
+    n = len(points_now)
+    # only the scoring places need ordering: partition those out, sort them
+    k = min(n, max([int(p) for p, v in points.items() if v] or [1]))
+    gain = np.array([points.get(p, 0.0) for p in range(1, k + 1)], dtype=float)
+    attend = np.asarray(attend, dtype=np.float32)
+    # Plackett-Luce as an exponential race: smallest Exp(1)/strength wins
+    inv_w = (1.0 / np.asarray(strength, dtype=float)).astype(np.float32)
+    top = np.zeros(n)
+    pts_sum = np.zeros(n)
+    kos_sum = np.zeros(n)
+    done = 0
+    while done < sims:
+        m = min(chunk, sims - done)
+        rows = np.arange(m)[:, None]
+        pts = np.tile(np.asarray(points_now, dtype=float), (m, 1))
+        entered = np.zeros((m, n), dtype=np.int32)
+        for _ in range(remaining):
+            enters = rng.random((m, n), dtype=np.float32) < attend
+            entered += enters
+            race = rng.standard_exponential((m, n), dtype=np.float32) * inv_w
+            race[~enters] = np.inf
+            idx = np.argpartition(race, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (m, 1))
+            sub = np.take_along_axis(race, idx, axis=1)
+            order = np.argsort(sub, axis=1)
+            idx = np.take_along_axis(idx, order, axis=1)
+            pts[rows, idx] += np.where(np.isfinite(np.take_along_axis(sub, order, axis=1)), gain, 0.0)
+        kos = np.asarray(kos_now, dtype=float) + rng.poisson(np.asarray(ko_rate, dtype=float) * entered)
+        # points first, then KOs; stable sort keeps name order for full ties
+        score = pts * (2 * (kos.max() + 1)) + kos
+        rank = np.argsort(-score, axis=1, kind="stable")
+        top += np.bincount(rank[:, :seats].ravel(), minlength=n)
+        pts_sum += pts.sum(axis=0)
+        kos_sum += kos.sum(axis=0)
+        done += m
+    return top / sims, pts_sum / sims, kos_sum / sims
+
+
+_CACHE = LRU(8, "projection")
+
+
+@timed("projection.season")
+def project_season(sheet_map: dict, points: dict, remaining: int = None, sims: int = 20000,
+                   seats: int = SEATS, seed: int = 0) -> pd.DataFrame:
+    """Seat odds, expected final points and expected bounty per player,
+    cached per standings version; treat the result as read-only."""
+    if remaining is None:
+        remaining = remaining_events(sheet_map)
+    version = tuple((str(k), frame_fingerprint(v)) for k, v in (sheet_map or {}).items()
+                    if is_event_sheet(k) and isinstance(v, pd.DataFrame))
+    key = (version, tuple(sorted(points.items())), remaining, sims, seats, seed)
+
+    def build():
+        g = season_inputs(sheet_map, points)
+        if g.empty:
+            return pd.DataFrame(columns=PROJECTION_COLUMNS)
+        p_top, e_pts, e_kos = simulate(
+            g["Points"].to_numpy(), g["KOs"].to_numpy(), g["Attend"].to_numpy(),
+            g["Strength"].to_numpy(), g["KO_Rate"].to_numpy(), points, remaining,
+            sims=sims, seats=seats, seed=seed)
+        out = g[["Player", "Points", "KOs", "Events_Played"]].assign(
+            P_Top5=p_top, Expected_Points=e_pts, Expected_KOs=e_kos, Expected_Bounty=e_kos * BOUNTY)
+        out = out.sort_values(["P_Top5", "Expected_Points"], ascending=[False, False], kind="stable")
+        return out[PROJECTION_COLUMNS].reset_index(drop=True)
+
+    return _CACHE.get_or_build(key, build)
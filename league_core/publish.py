@@ -0,0 +1,242 @@
+"""Precompute the player-facing views into static, versioned artifacts.
+
+The tracker only changes once per event night, so everything Player Home
+computes (leaderboard, pool balances, nightly payouts, bounties, second
+chance, player finances) can be built once from ``tracker.xlsx``::
+
+    python -m league_core.publish tracker.xlsx --out site
+
+Each build goes to ``site/v-<tracker hash>-<code hash>/``: the first 12 of
+the tracker's SHA-256 and the first 8 of a hash over the modules the views
+are computed by (``code_version``), so changing the view code gets a new
+build. A build holds one JSON file per view (plus Parquet when pyarrow is
+available), a ``manifest.json`` with row counts and file hashes, and a small
+self-contained ``index.html``. ``site/latest.json`` and ``site/index.html``
+(a redirect) point at the newest build, so the directory can be hosted as
+plain static files. Nothing in a build depends on the clock or the machine:
+the same tracker and code produce the same bytes, and an existing build of
+the same version is left untouched unless ``--force`` is given.
+"""
+import argparse
+import functools
+import hashlib
+import html
+import json
+import os
+import sys
+
+import pandas as pd
+
+from league_core.facts import event_facts, event_tables
+from league_core.finance import build_financials
+from league_core.leaderboard import LeaderboardAggregator
+from league_core.league import POINTS, TRACKER_PATH, kpi_totals
+from league_core.perf import timed
+from league_core.pools import pool_balances, pool_summary
+from league_core.workbook import content_hash, parse_workbook
+
+FORMAT_VERSION = 1
+SITE_DIR = "site"
+LATEST = "latest.json"
+MANIFEST = "manifest.json"
+# league_core modules whose code decides what the views contain
+VIEW_MODULES = ("columns", "facts", "finance", "leaderboard", "league", "money", "pools", "publish")
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    h = hashlib.sha256(b"format %d" % FORMAT_VERSION)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in VIEW_MODULES:
+        with open(os.path.join(here, f"{name}.py"), "rb") as f:
+            h.update(f.read().replace(b"\r\n", b"\n"))
+    return h.hexdigest()
+
+
+def build_version(xlsx_bytes: bytes = None, source_sha256: str = None) -> str:
+    digest = source_sha256 or content_hash(xlsx_bytes)
+    return f"v-{digest[:12]}-{code_version()[:8]}"
+
+
+def build_views(sheet_map: dict) -> dict:
+    """``{name: DataFrame}`` for every published view, plus ``kpis`` (a dict)."""
+    per_event = event_tables(sheet_map)   # already in event-number order
+    facts = pd.concat(per_event.values(), ignore_index=True) if per_event else event_facts(sheet_map)
+    ledger = sheet_map.get("Pools_Ledger", pd.DataFrame())
+    optins = sheet_map.get("SecondChance_OptIns", pd.DataFrame())
+    wsop, bounty, high_hand, nightly = kpi_totals(pool_balances(ledger))
+    second_chance = float(optins["Buy-In ($)"].fillna(0).sum()) if "Buy-In ($)" in optins else 0.0
+    return {
+        "kpis": {"wsop_pool": wsop, "seat_value": wsop / 5 if wsop else 0.0,
+                 "bounty_pool": bounty, "high_hand_pool": high_hand,
+                 "nightly_pool": nightly, "second_chance_pool": second_chance},
+        "leaderboard": LeaderboardAggregator(POINTS).sync(sheet_map).to_frame().rename_axis("Rank").reset_index(),
+        "pools": pool_summary(ledger, split=True).rename_axis("Pool").reset_index(),
+        "nightly_payouts": facts[["Event", "Place", "Player", "Payout"]].astype({"Player": str}).reset_index(drop=True),
+        "bounties": facts[["Event", "Place", "Player", "KOs"]].astype({"Player": str})
+                    .assign(**{"Bounty $": facts["KOs"].to_numpy() * 5}).reset_index(drop=True),
+        "second_chance": optins.reset_index(drop=True),
+        "finances": build_financials(sheet_map),
+        "events": sheet_map.get("Events", pd.DataFrame()).reset_index(drop=True),
+    }
+
+
+def _json_bytes(obj) -> bytes:
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_json(orient="split", index=False, date_format="iso", date_unit="s",
+                           double_precision=10, force_ascii=False).encode("utf-8")
+    return json.dumps(obj, sort_keys=True, indent=1).encode("utf-8")
+
+
+def _parquet_bytes(df: pd.DataFrame):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    import io
+
+    df = df.copy()
+    for c in df.columns:
+        if df[c].dtype == object:
+            # hand-edited sheets mix numbers and strings in one column
+            df[c] = df[c].map(lambda v: None if pd.isna(v) else str(v))
+    df.columns = [str(c) for c in df.columns]
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+
+def _money(v):
+    return f"${v:,.2f}"
+
+
+def render_html(views: dict, version: str) -> bytes:
+    k = views["kpis"]
+    cards = "".join(
+        f"<div class='kpi'><span>{html.escape(label)}</span><b>{_money(k[key])}</b></div>"
+        for label, key in [("WSOP Pool", "wsop_pool"), ("Seat Value (each of 5)", "seat_value"),
+                           ("Bounty Pool", "bounty_pool"), ("High Hand", "high_hand_pool"),
+                           ("Nightly Pool", "nightly_pool"), ("Second Chance Pool", "second_chance_pool")])
+
+    def table(name, title):
+        df = views[name]
+        body = df.to_html(index=False, border=0, na_rep="", float_format=lambda v: f"{v:,.2f}")
+        return f"<h2>{html.escape(title)}</h2>\n{body}\n<p class='dl'><a href='{name}.json'>{name}.json</a></p>"
+
+    page = f"""<!doctype html>
+<html lang="en"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>WSOP League — Standings</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 1.5rem auto; max-width: 960px; padding: 0 1rem; }}
+.kpis {{ display: flex; flex-wrap: wrap; gap: .75rem; }}
+.kpi {{ border: 1px solid #ddd; border-radius: 6px; padding: .5rem .75rem; min-width: 9rem; }}
+.kpi span {{ display: block; font-size: .8rem; color: #555; }}
+table {{ border-collapse: collapse; width: 100%; font-size: .9rem; }}
+th, td {{ padding: .25rem .5rem; border-bottom: 1px solid #eee; text-align: left; }}
+.dl, footer {{ font-size: .8rem; color: #777; }}
+</style></head>
+<body>
+<h1>WSOP League</h1>
+<div class="kpis">{cards}</div>
+{table("leaderboard", "Leaderboard")}
+{table("finances", "Player Finances")}
+{table("pools", "Pools")}
+{table("second_chance", "Second Chance Opt-Ins")}
+<footer>Build {html.escape(version)} • nightly payouts and bounties by event:
+<a href="nightly_payouts.json">nightly_payouts.json</a>, <a href="bounties.json">bounties.json</a></footer>
+</body></html>
+"""
+    return page.encode("utf-8")
+
+
+def _write(path, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+@timed("export.site")
+def publish_site(xlsx_bytes: bytes, out_dir: str = SITE_DIR, parquet: bool = True,
+                 force: bool = False) -> dict:
+    """Build (or reuse, unless ``force``) the versioned artifacts for
+    ``xlsx_bytes`` under ``out_dir`` and point ``latest.json`` at them.
+    Returns the manifest."""
+    version = build_version(xlsx_bytes)
+    build_dir = os.path.join(out_dir, version)
+    manifest = None if force else read_manifest(build_dir)
+    if manifest is None:
+        views = build_views(parse_workbook(xlsx_bytes))
+        files = {}
+        for name, view in views.items():
+            files[f"{name}.json"] = _json_bytes(view)
+            if parquet and isinstance(view, pd.DataFrame):
+                pq_bytes = _parquet_bytes(view)
+                if pq_bytes is not None:
+                    files[f"{name}.parquet"] = pq_bytes
+        files["index.html"] = render_html(views, version)
+        manifest = {
+            "format": FORMAT_VERSION, "version": version,
+            "source_sha256": content_hash(xlsx_bytes), "code_version": code_version(),
+            "views": {name: {"rows": len(v) if isinstance(v, pd.DataFrame) else None}
+                      for name, v in views.items()},
+            "files": {f: hashlib.sha256(b).hexdigest() for f, b in sorted(files.items())},
+        }
+        os.makedirs(build_dir, exist_ok=True)
+        for fname, b in files.items():
+            _write(os.path.join(build_dir, fname), b)
+        # manifest last, so a half-written build is never picked up
+        _write(os.path.join(build_dir, MANIFEST), _json_bytes(manifest))
+    _write(os.path.join(out_dir, "index.html"), (
+        f'<!doctype html>\n<meta charset="utf-8">\n<meta http-equiv="refresh" content="0; url={version}/">\n'
+        f'<a href="{version}/">Latest standings</a>\n').encode("utf-8"))
+    _write(os.path.join(out_dir, LATEST), _json_bytes({"version": version, "source_sha256": manifest["source_sha256"]}))
+    return manifest
+
+
+def read_manifest(build_dir: str):
+    try:
+        with open(os.path.join(build_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == FORMAT_VERSION else None
+
+
+def load_view(out_dir: str, name: str, source_sha256: str = None):
+    """A published view from the latest build, or None if there is no build
+    or (given ``source_sha256``) it was built from a different tracker or by
+    different view code."""
+    try:
+        with open(os.path.join(out_dir, LATEST)) as f:
+            latest = json.load(f)
+        if source_sha256 and latest.get("version") != build_version(source_sha256=source_sha256):
+            return None
+        with open(os.path.join(out_dir, latest["version"], f"{name}.json")) as f:
+            data = json.load(f)
+    except (OSError, ValueError, KeyError):
+        return None
+    if isinstance(data, dict) and set(data) == {"columns", "data"}:
+        return pd.DataFrame(data["data"], columns=data["columns"])
+    return data
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m league_core.publish", description=__doc__.split("\n\n")[0])
+    ap.add_argument("tracker", nargs="?", default=TRACKER_PATH)
+    ap.add_argument("--out", default=SITE_DIR, help="site directory (default: %(default)s)")
+    ap.add_argument("--no-parquet", action="store_true", help="only write JSON")
+    ap.add_argument("--force", action="store_true", help="rebuild even if this version already exists")
+    args = ap.parse_args(argv)
+    with open(args.tracker, "rb") as f:
+        b = f.read()
+    manifest = publish_site(b, args.out, parquet=not args.no_parquet, force=args.force)
+    print(f"{os.path.join(args.out, manifest['version'])}: {len(manifest['files'])} files "
+          f"from {args.tracker} (sha256 {manifest['source_sha256'][:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
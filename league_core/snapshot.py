@@ -0,0 +1,263 @@
+"""Columnar snapshot of a tracker workbook for fast cold starts.
+
+``tracker.xlsx`` stays the source of truth. Next to it, ``tracker.snapshot/``
+holds one uncompressed Arrow IPC (Feather v2) file per sheet plus a
+``manifest.json`` recording the SHA-256 of the xlsx it was built from. Readers
+only use the snapshot when that hash matches the current xlsx bytes, and
+memory-map the sheet files instead of running openpyxl.
+
+Sheet file names start with that hash and existing files are never written
+in place, so a reader holding an older manifest keeps mapping the files it
+names while a new snapshot is written next to them. The snapshot is not
+committed: the apps build it after the first parse of a tracker version
+(``refresh_snapshot``), so it follows every publish.
+
+Excel columns that mix types (a Payout column with both ``520`` and
+``"$280"``) don't fit a single Arrow type; they are stored as a struct with
+one field per Python type and rebuilt into the same object column on load.
+
+Build a snapshot for an existing tracker with::
+
+    python -m league_core.snapshot tracker.xlsx
+"""
+import datetime as dt
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from league_core.perf import timed
+from league_core.workbook import LazySheetMap, LazyWorkbook, content_hash
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+_MIXED_FIELDS = ("b", "i", "f", "s", "t")
+
+
+def snapshot_path(xlsx_path: str) -> str:
+    return os.path.splitext(xlsx_path)[0] + ".snapshot"
+
+
+def _mixed_kind(v):
+    if v is None or v is pd.NaT or v is pd.NA:
+        return None
+    if isinstance(v, (bool, np.bool_)):
+        return "b"
+    if isinstance(v, (int, np.integer)):
+        return "i" if -2**63 <= v < 2**63 else "s"
+    if isinstance(v, (float, np.floating)):
+        return "f"
+    if isinstance(v, (dt.datetime, dt.date)):
+        return "t"
+    return "s"
+
+
+def _encode_mixed(values):
+    import pyarrow as pa
+
+    fields = {k: [None] * len(values) for k in _MIXED_FIELDS}
+    for i, v in enumerate(values):
+        k = _mixed_kind(v)
+        if k == "t":
+            v = pd.Timestamp(v).to_pydatetime()
+        elif k == "s":
+            v = str(v)
+        if k:
+            fields[k][i] = v
+    return pa.StructArray.from_arrays(
+        [pa.array(fields["b"], pa.bool_()), pa.array(fields["i"], pa.int64()),
+         pa.array(fields["f"], pa.float64()), pa.array(fields["s"], pa.string()),
+         pa.array(fields["t"], pa.timestamp("us"))],
+        names=list(_MIXED_FIELDS))
+
+
+def _decode_mixed(arr) -> pd.Series:
+    out = np.full(len(arr), None, dtype=object)
+    for k in _MIXED_FIELDS:
+        child = arr.field(k)
+        vals = child.to_pylist()
+        for i in np.flatnonzero(child.is_valid().to_numpy(zero_copy_only=False)):
+            v = vals[i]
+            out[i] = pd.Timestamp(v) if k == "t" else v
+    return pd.Series(out)
+
+
+def _to_table(df: pd.DataFrame):
+    import pyarrow as pa
+
+    arrays, mixed = [], []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        try:
+            arrays.append(pa.array(col, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(_encode_mixed(col.tolist()))
+            mixed.append(i)
+    names = [f"c{i}" for i in range(df.shape[1])]
+    return pa.Table.from_arrays(arrays, names=names), mixed
+
+
+def _sheet_tables(sheet_map: dict, digest: str):
+    """``(manifest entry, Arrow table)`` for each DataFrame sheet."""
+    for n, (name, df) in enumerate((sheet_map or {}).items()):
+        if not isinstance(df, pd.DataFrame):
+            continue
+        table, mixed = _to_table(df)
+        yield {"name": str(name), "file": f"{digest[:12]}-{n:03d}.feather", "rows": len(df),
+               "columns": [c if isinstance(c, (int, float)) else str(c) for c in df.columns],
+               "mixed": mixed}, table
+
+
+@timed("export.snapshot")
+def write_snapshot(sheet_map: dict, out_dir: str, xlsx_bytes: bytes) -> dict:
+    """Write one Feather file per sheet, then the manifest (last, via rename,
+    so a half-written snapshot never matches), then drop sheet files that
+    neither the new nor the previous manifest names."""
+    import pyarrow.feather as feather
+
+    os.makedirs(out_dir, exist_ok=True)
+    digest = content_hash(xlsx_bytes)
+    previous = read_manifest(out_dir) or {"sheets": []}
+    tag = f"{os.getpid()}.{threading.get_ident()}.tmp"
+    sheets = []
+    for sh, table in _sheet_tables(sheet_map, digest):
+        path = os.path.join(out_dir, sh["file"])
+        feather.write_feather(table, f"{path}.{tag}", compression="uncompressed")
+        os.replace(f"{path}.{tag}", path)
+        sheets.append(sh)
+    manifest = {"format": FORMAT_VERSION, "xlsx_sha256": digest, "sheets": sheets}
+    tmp = os.path.join(out_dir, f"{MANIFEST}.{tag}")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    keep = {sh["file"] for sh in sheets + previous["sheets"]}
+    for fname in os.listdir(out_dir):
+        if fname.endswith(".feather") and fname not in keep:
+            try:
+                os.remove(os.path.join(out_dir, fname))
+            except OSError:
+                pass
+    return manifest
+
+
+_refreshing = set()
+_refresh_lock = threading.Lock()
+
+
+def refresh_snapshot(xlsx_path: str, xlsx_bytes: bytes, digest: str):
+    """Build the snapshot for ``xlsx_bytes`` in a background thread unless it
+    is current or already being built; best effort (no pyarrow, read-only
+    checkout) and never blocks the caller."""
+    snap_dir = snapshot_path(xlsx_path)
+    manifest = read_manifest(snap_dir)
+    if manifest and manifest.get("xlsx_sha256") == digest:
+        return
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return
+    with _refresh_lock:
+        if (snap_dir, digest) in _refreshing:
+            return
+        _refreshing.add((snap_dir, digest))
+
+    def build():
+        from league_core.workbook import parse_workbook
+        try:
+            write_snapshot(parse_workbook(xlsx_bytes), snap_dir, xlsx_bytes)
+        except Exception:
+            pass
+        finally:
+            with _refresh_lock:
+                _refreshing.discard((snap_dir, digest))
+
+    threading.Thread(target=build, name="snapshot-refresh", daemon=True).start()
+
+
+def read_manifest(snap_dir: str):
+    try:
+        with open(os.path.join(snap_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == FORMAT_VERSION else None
+
+
+def _load_sheet(snap_dir: str, sh: dict) -> pd.DataFrame:
+    import pyarrow.feather as feather
+
+    table = feather.read_table(os.path.join(snap_dir, sh["file"]), memory_map=True)
+    mixed = set(sh["mixed"])
+    cols = {}
+    for i in range(table.num_columns):
+        col = table.column(i).combine_chunks()
+        if i in mixed:
+            cols[i] = _decode_mixed(col)
+        else:
+            s = col.to_pandas()
+            if s.dtype == object:
+                s = s.where(s.notna(), np.nan)
+            cols[i] = s
+    df = pd.DataFrame(cols, index=pd.RangeIndex(sh["rows"]))
+    df.columns = sh["columns"]
+    return df
+
+
+def read_snapshot(snap_dir: str, expected_hash: str):
+    """Lazy sheet map over the snapshot, or None if it is missing, stale, or
+    pyarrow is unavailable. Sheets are memory-mapped on first access."""
+    manifest = read_manifest(snap_dir)
+    if not manifest or manifest.get("xlsx_sha256") != expected_hash:
+        return None
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return None
+    by_name = {sh["name"]: sh for sh in manifest["sheets"]}
+    if not all(os.path.exists(os.path.join(snap_dir, sh["file"])) for sh in by_name.values()):
+        return None
+    return LazySheetMap(LazyWorkbook(by_name, lambda name: _load_sheet(snap_dir, by_name[name])))
+
+
+@timed("export.snapshot_zip")
+def pack_snapshot(sheet_map: dict, xlsx_bytes: bytes, arcname: str = "tracker.snapshot") -> bytes:
+    """Zip (stored, not deflated) of the snapshot for ``xlsx_bytes``, built
+    in memory for download; unzipped it is the same directory
+    ``write_snapshot`` produces."""
+    import io
+    import zipfile
+
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    digest = content_hash(xlsx_bytes)
+    sheets = []
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for sh, table in _sheet_tables(sheet_map, digest):
+            sink = pa.BufferOutputStream()
+            feather.write_feather(table, sink, compression="uncompressed")
+            zf.writestr(f"{arcname}/{sh['file']}", sink.getvalue().to_pybytes())
+            sheets.append(sh)
+        manifest = {"format": FORMAT_VERSION, "xlsx_sha256": digest, "sheets": sheets}
+        zf.writestr(f"{arcname}/{MANIFEST}", json.dumps(manifest, indent=1))
+    return buf.getvalue()
+
+
+def main(argv=None):
+    from league_core.workbook import parse_workbook
+
+    argv = sys.argv[1:] if argv is None else argv
+    xlsx = argv[0] if argv else "tracker.xlsx"
+    with open(xlsx, "rb") as f:
+        b = f.read()
+    manifest = write_snapshot(parse_workbook(b), snapshot_path(xlsx), b)
+    print(f"{snapshot_path(xlsx)}: {len(manifest['sheets'])} sheets, xlsx sha256 {manifest['xlsx_sha256'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""SQLite-backed league store, an optional alternative to ``tracker.xlsx``.
+
+Each tracker sheet becomes rows in a typed table (events, standings, players,
+pools ledger, supplies, opt-ins, buy-ins, high hand; anything else goes to
+``other_rows``). The typed columns hold the normalized values the dashboards
+query (stripped player names, parsed payouts and amounts, signed ledger
+rows) and are indexed on player and event number, so the leaderboard, pool
+balances and player finances are SQL aggregates rather than pandas passes
+over the whole workbook.
+
+Every row also keeps its original cells as JSON in ``raw`` and the
+``sheets`` table records sheet order, column names and dtypes, which is
+what makes the xlsx import/export round trip exact. Sheets read back through
+``LeagueDB.sheet_map()`` are loaded lazily, one query per sheet, and
+``open_reader`` shares one read-only connection and sheet map per database
+version between sessions.
+
+Import a tracker and export it again with::
+
+    python -m league_core.sqlite_store import tracker.xlsx league.db
+    python -m league_core.sqlite_store export league.db tracker.xlsx
+"""
+import datetime as dt
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from league_core.columns import colmap, is_event_sheet, norm, pick
+from league_core.facts import FACT_COLUMNS, event_number, event_sort_key
+from league_core.leaderboard import LEADERBOARD_COLUMNS
+from league_core.money import parse_money_series
+from league_core.perf import count, timed
+from league_core.pools import _ledger_rows
+from league_core.workbook import LazySheetMap, LazyWorkbook, frame_fingerprint
+
+LEAGUE_DB = "league.db"
+
+# sheet name -> table; event standings sheets go to "standings", anything
+# not listed here to "other_rows"
+SHEET_TABLES = {
+    "Events": "events",
+    "Players": "players",
+    "Pools_Ledger": "pools_ledger",
+    "Supplies": "supplies",
+    "SecondChance_OptIns": "optins",
+    "Series_BuyIns": "buyins",
+    "HighHand_Info": "high_hand",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    name TEXT PRIMARY KEY, position INTEGER NOT NULL, tbl TEXT NOT NULL,
+    columns TEXT NOT NULL, dtypes TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    sheet TEXT, row_no INTEGER, event_no INTEGER, date TEXT, location TEXT, raw TEXT);
+CREATE TABLE IF NOT EXISTS standings (
+    sheet TEXT, row_no INTEGER, event_no INTEGER, player TEXT, place REAL,
+    kos INTEGER, payout REAL, raw TEXT);
+CREATE TABLE IF NOT EXISTS players (
+    sheet TEXT, row_no INTEGER, player TEXT, active INTEGER, raw TEXT);
+CREATE TABLE IF NOT EXISTS pools_ledger (
+    sheet TEXT, row_no INTEGER, event_no INTEGER, type TEXT, pool TEXT,
+    amount REAL, sign INTEGER, raw TEXT);
+CREATE TABLE IF NOT EXISTS supplies (
+    sheet TEXT, row_no INTEGER, event_no INTEGER, item TEXT, amount REAL, raw TEXT);
+CREATE TABLE IF NOT EXISTS optins (
+    sheet TEXT, row_no INTEGER, event_no INTEGER, player TEXT, buy_in REAL, raw TEXT);
+CREATE TABLE IF NOT EXISTS buyins (
+    sheet TEXT, row_no INTEGER, player TEXT, amount REAL, raw TEXT);
+CREATE TABLE IF NOT EXISTS high_hand (
+    sheet TEXT, row_no INTEGER, holder TEXT, description TEXT, raw TEXT);
+CREATE TABLE IF NOT EXISTS other_rows (
+    sheet TEXT, row_no INTEGER, raw TEXT);
+CREATE TABLE IF NOT EXISTS sheet_fingerprints (
+    name TEXT PRIMARY KEY, fingerprint TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS standings_player ON standings (player);
+CREATE INDEX IF NOT EXISTS standings_event ON standings (event_no);
+CREATE INDEX IF NOT EXISTS standings_sheet ON standings (sheet, row_no);
+CREATE INDEX IF NOT EXISTS players_player ON players (player);
+CREATE INDEX IF NOT EXISTS ledger_pool ON pools_ledger (pool);
+CREATE INDEX IF NOT EXISTS ledger_event ON pools_ledger (event_no);
+CREATE INDEX IF NOT EXISTS supplies_event ON supplies (event_no, item);
+CREATE INDEX IF NOT EXISTS optins_event ON optins (event_no);
+CREATE INDEX IF NOT EXISTS optins_player ON optins (player);
+CREATE INDEX IF NOT EXISTS buyins_player ON buyins (player);
+CREATE INDEX IF NOT EXISTS events_event ON events (event_no);
+CREATE INDEX IF NOT EXISTS other_sheet ON other_rows (sheet, row_no);
+"""
+
+TABLES = ["events", "standings", "players", "pools_ledger", "supplies",
+          "optins", "buyins", "high_hand", "other_rows"]
+
+
+def sheet_table(name) -> str:
+    if is_event_sheet(name):
+        return "standings"
+    return SHEET_TABLES.get(str(name), "other_rows")
+
+
+# Cell encoding -------------------------------------------------------------
+def _cell(v):
+    if v is None or v is pd.NaT or v is pd.NA:
+        return None
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        return None if math.isnan(v) else float(v)
+    if isinstance(v, str):
+        return v
+    if isinstance(v, (dt.datetime, dt.date)):
+        return {"t": pd.Timestamp(v).isoformat()}
+    if isinstance(v, dt.time):
+        return {"tm": v.isoformat()}
+    return str(v)
+
+
+def _uncell(v):
+    if isinstance(v, dict):
+        if "t" in v:
+            return pd.Timestamp(v["t"])
+        if "tm" in v:
+            return dt.time.fromisoformat(v["tm"])
+    return v
+
+
+def _raw_rows(df: pd.DataFrame):
+    cols = [df.iloc[:, i].tolist() for i in range(df.shape[1])]
+    return [json.dumps([_cell(c[r]) for c in cols]) for r in range(len(df))]
+
+
+def _restore(values, dtype: str) -> pd.Series:
+    s = pd.Series(values, dtype=object)
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(s).astype(dtype)
+    if dtype == "float64" or dtype in ("int64", "bool") and s.notna().all():
+        return s.astype(dtype)
+    return s.where(s.notna(), np.nan)
+
+
+def _sql(v):
+    """NaN/NA -> NULL, numpy scalars -> Python ones."""
+    if v is None or v is pd.NA or v is pd.NaT:
+        return None
+    if isinstance(v, (np.integer, np.bool_)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        return None if math.isnan(v) else float(v)
+    return v if isinstance(v, (int, str)) else str(v)
+
+
+# Typed columns -------------------------------------------------------------
+def _column(df, cols, *names):
+    c = pick(cols, *names)
+    return df[c] if c else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _numbers(s):
+    return pd.to_numeric(s, errors="coerce")
+
+
+def _typed(table: str, name, df: pd.DataFrame) -> dict:
+    cols = colmap(df)
+    if table == "standings":
+        pcol = pick(cols, "player", "name")
+        kcol = pick(cols, "kos", "knockouts", "eliminations", "elims", "numeliminated", "eliminated")
+        payout = pick(cols, "payout", "payoutamount")
+        return {
+            "event_no": [event_number(name)] * len(df),
+            "player": df[pcol].astype(str).str.strip() if pcol else [None] * len(df),
+            "place": _numbers(_column(df, cols, "place", "rank", "finish", "position")),
+            "kos": _numbers(df[kcol]).fillna(0).astype(int) if kcol else [0] * len(df),
+            "payout": parse_money_series(df[payout]) if payout else [None] * len(df),
+        }
+    if table == "pools_ledger":
+        t = _ledger_rows(df)
+        if t is None:
+            return {}
+        return {"event_no": t["Event #"], "type": _column(df, cols, "type"),
+                "pool": t["Pool"], "amount": t["Amount"], "sign": t["Sign"]}
+    if table == "events":
+        return {"event_no": _numbers(_column(df, cols, "event", "eventno", "eventnumber")),
+                "date": _column(df, cols, "date"),
+                "location": _column(df, cols, "locationname", "location")}
+    if table == "players":
+        return {"player": _column(df, cols, "player", "name"), "active": _column(df, cols, "active")}
+    if table == "supplies":
+        return {"event_no": _numbers(_column(df, cols, "event", "eventno", "eventnumber")),
+                "item": _column(df, cols, "item"),
+                "amount": _numbers(_column(df, cols, "amount", "amt", "value"))}
+    if table == "optins":
+        return {"event_no": _numbers(_column(df, cols, "event", "eventno", "eventnumber")),
+                "player": _column(df, cols, "player", "name"),
+                "buy_in": parse_money_series(_column(df, cols, "buyin", "amount"))}
+    if table == "buyins":
+        return {"player": _column(df, cols, "player", "name"),
+                "amount": _numbers(_column(df, cols, "amount", "amt", "value"))}
+    if table == "high_hand":
+        return {"holder": _column(df, cols, "currentholder", "holder"),
+                "description": _column(df, cols, "handdescription", "hand")}
+    return {}
+
+
+class LeagueDB:
+    """One SQLite database file holding a whole league tracker.
+
+    Writers replace whole sheets inside a transaction; readers (``readonly``)
+    open the file in query-only mode and, with WAL journaling, never block
+    on a writer."""
+
+    def __init__(self, path: str = LEAGUE_DB, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            if path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # Writes ------------------------------------------------------------
+    def _delete_sheet(self, name):
+        row = self.conn.execute("SELECT tbl FROM sheets WHERE name = ?", (name,)).fetchone()
+        if row:
+            self.conn.execute(f"DELETE FROM {row[0]} WHERE sheet = ?", (name,))
+            self.conn.execute("DELETE FROM sheets WHERE name = ?", (name,))
+        self.conn.execute("DELETE FROM sheet_fingerprints WHERE name = ?", (name,))
+
+    def _write_sheet(self, name, df: pd.DataFrame, position: int):
+        table = sheet_table(name)
+        self.conn.execute(
+            "INSERT INTO sheets VALUES (?, ?, ?, ?, ?)",
+            (name, position, table,
+             json.dumps([_cell(c) for c in df.columns]), json.dumps([str(t) for t in df.dtypes])))
+        self.conn.execute("INSERT INTO sheet_fingerprints VALUES (?, ?)", (name, frame_fingerprint(df)))
+        typed = {k: [_sql(v) for v in vals] for k, vals in _typed(table, name, df).items()}
+        fields = ["sheet", "row_no"] + list(typed) + ["raw"]
+        rows = zip([name] * len(df), range(len(df)), *typed.values(), _raw_rows(df))
+        self.conn.executemany(
+            f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})", rows)
+
+    @timed("sqlite.save")
+    def save_sheets(self, sheets: dict, exact: bool = False) -> list:
+        """Replace (or add) the given sheets in one transaction, skipping any
+        whose content fingerprint matches the stored copy; other sheets are
+        untouched, so saving an ingest only rewrites what it changed. With
+        ``exact`` the database ends up holding just ``sheets``, in that
+        order. Returns the names written."""
+        frames = {str(k): v for k, v in (sheets or {}).items() if isinstance(v, pd.DataFrame)}
+        written = []
+        with self._lock, self.conn:
+            positions = dict(self.conn.execute("SELECT name, position FROM sheets"))
+            stored = dict(self.conn.execute("SELECT name, fingerprint FROM sheet_fingerprints"))
+            if exact:
+                for name in positions:
+                    if name not in frames:
+                        self._delete_sheet(name)
+                positions = {name: pos for pos, name in enumerate(frames)}
+            nxt = max(positions.values(), default=-1) + 1
+            for name, df in frames.items():
+                pos = positions.get(name)
+                if pos is None:
+                    pos, nxt = nxt, nxt + 1
+                if name in stored and stored[name] == frame_fingerprint(df):
+                    self.conn.execute("UPDATE sheets SET position = ? WHERE name = ?", (pos, name))
+                    continue
+                self._delete_sheet(name)
+                self._write_sheet(name, df, pos)
+                written.append(name)
+        return written
+
+    @timed("sqlite.import")
+    def import_sheets(self, sheet_map: dict):
+        """Replace the whole database with ``sheet_map``."""
+        with self._lock, self.conn:
+            for t in TABLES + ["sheets", "sheet_fingerprints"]:
+                self.conn.execute(f"DELETE FROM {t}")
+            for pos, (name, df) in enumerate((sheet_map or {}).items()):
+                if isinstance(df, pd.DataFrame):
+                    self._write_sheet(str(name), df, pos)
+
+    # Reads -------------------------------------------------------------
+    def sheet_names(self):
+        return [r[0] for r in self._query("SELECT name FROM sheets ORDER BY position")]
+
+    @timed("sqlite.read_sheet")
+    def read_sheet(self, name) -> pd.DataFrame:
+        meta = self._query("SELECT tbl, columns, dtypes FROM sheets WHERE name = ?", (name,))
+        if not meta:
+            raise KeyError(name)
+        table, columns, dtypes = meta[0]
+        columns, dtypes = [_uncell(c) for c in json.loads(columns)], json.loads(dtypes)
+        rows = [json.loads(r[0]) for r in self._query(
+            f"SELECT raw FROM {table} WHERE sheet = ? ORDER BY row_no", (name,))]
+        data = {}
+        for i, dtype in enumerate(dtypes):
+            data[i] = _restore([_uncell(r[i]) for r in rows], dtype)
+        df = pd.DataFrame(data, index=pd.RangeIndex(len(rows)))
+        df.columns = columns
+        return df
+
+    def sheet_map(self) -> LazySheetMap:
+        """Sheet map over the database; each sheet is queried on first use."""
+        return LazySheetMap(LazyWorkbook(self.sheet_names(), self.read_sheet))
+
+    # Event views -------------------------------------------------------
+    def _facts(self, rows) -> pd.DataFrame:
+        f = pd.DataFrame(rows, columns=FACT_COLUMNS)
+        return f.astype({"Event": "Int64", "Place": "Int64", "KOs": int, "Payout": float})
+
+    def event_sheets(self) -> list:
+        """Standings sheets with a player column, in event-number order."""
+        rows = self._query("SELECT DISTINCT sheet FROM standings WHERE player IS NOT NULL")
+        return sorted((r[0] for r in rows), key=event_sort_key)
+
+    @timed("sqlite.event_table")
+    def event_table(self, sheet) -> pd.DataFrame:
+        """One sheet's rows as ``league_core.facts.event_tables`` gives them."""
+        t = self._facts(self._query(
+            "SELECT event_no, sheet, player, place, kos, payout FROM standings "
+            "WHERE sheet = ? AND player IS NOT NULL ORDER BY row_no", (sheet,)))
+        meta = self._query("SELECT columns FROM sheets WHERE name = ?", (sheet,))
+        columns = [_uncell(c) for c in json.loads(meta[0][0])] if meta else []
+        if not pick({norm(c): c for c in columns}, "place", "rank", "finish", "position"):
+            t["Place"] = pd.array(range(1, len(t)+1), dtype="Int64")
+        return t
+
+    def event_tables(self) -> LazySheetMap:
+        """``{sheet: event_table(sheet)}`` in event order, queried on first use."""
+        return LazySheetMap(LazyWorkbook(self.event_sheets(), self.event_table))
+
+    def player_names(self) -> list:
+        return [r[0] for r in self._query(
+            "SELECT DISTINCT player FROM standings WHERE player IS NOT NULL ORDER BY player")]
+
+    @timed("sqlite.player_history")
+    def player_history(self, player) -> pd.DataFrame:
+        """Same frame as ``league_core.facts.player_history``."""
+        return self._facts(self._query(
+            "SELECT event_no, sheet, player, place, kos, payout FROM standings WHERE player = ? "
+            "ORDER BY event_no IS NULL, event_no, sheet, row_no", (str(player),)))
+
+    def to_xlsx(self) -> bytes:
+        from league_core.workbook import serialize_workbook
+
+        return serialize_workbook({n: self.read_sheet(n) for n in self.sheet_names()})
+
+    # Aggregates --------------------------------------------------------
+    @timed("sqlite.leaderboard")
+    def leaderboard(self, points: dict) -> pd.DataFrame:
+        """Same frame as ``LeaderboardAggregator.to_frame()``."""
+        pts = list(points.items())
+        values = ", ".join("(?, ?)" for _ in pts) or "(NULL, 0)"
+        rows = self._query(f"""
+            WITH pts(place, points) AS (VALUES {values})
+            SELECT s.player, SUM(COALESCE(p.points, 0)), SUM(s.kos), COUNT(*)
+            FROM standings s LEFT JOIN pts p ON p.place = s.place
+            WHERE s.player IS NOT NULL AND s.place IS NOT NULL
+            GROUP BY s.player
+            ORDER BY 2 DESC, 3 DESC, s.player""", [x for kv in pts for x in kv])
+        g = pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+        g["Total_Points"] = g["Total_Points"].astype(float)
+        g["Total_KOs"] = g["Total_KOs"].astype(int)
+        g["Events_Played"] = g["Events_Played"].astype(int)
+        g.index = g.index + 1
+        return g
+
+    @timed("sqlite.pools")
+    def pool_summary(self, split: bool = False) -> pd.DataFrame:
+        """Same frame as ``league_core.pools.pool_summary``."""
+        rows = self._query("""
+            SELECT pool, SUM(amount * sign),
+                   SUM(CASE WHEN sign > 0 THEN amount ELSE 0 END),
+                   SUM(CASE WHEN sign < 0 THEN amount ELSE 0 END)
+            FROM pools_ledger GROUP BY pool ORDER BY pool""")
+        out = pd.DataFrame(rows, columns=["Pool", "Balance", "Accrued", "Paid Out"]).set_index("Pool")
+        out = out.astype(float).fillna(0.0)
+        return out if split else out[["Balance"]]
+
+    def pool_balances(self) -> dict:
+        return self.pool_summary()["Balance"].to_dict()
+
+    @timed("sqlite.financials")
+    def financials(self) -> pd.DataFrame:
+        """Same frame as ``league_core.finance.build_financials``."""
+        rows = self._query("""
+            WITH base AS (
+                SELECT player, MIN(rowid) AS first FROM players
+                WHERE player IS NOT NULL GROUP BY player),
+            played AS (
+                SELECT player, COUNT(*) AS n, COALESCE(SUM(payout), 0) AS payouts,
+                       SUM(kos) * 5.0 AS bounties
+                FROM standings WHERE player IS NOT NULL AND payout IS NOT NULL GROUP BY player),
+            paid AS (
+                SELECT player, SUM(amount) AS amount FROM buyins
+                WHERE player IS NOT NULL GROUP BY player)
+            SELECT b.player, COALESCE(p.n, 0), COALESCE(paid.amount, 0.0),
+                   COALESCE(p.payouts, 0.0), COALESCE(p.bounties, 0.0)
+            FROM base b
+            LEFT JOIN played p ON p.player = b.player
+            LEFT JOIN paid ON paid.player = b.player
+            ORDER BY b.first""")
+        out = pd.DataFrame(rows, columns=["Player", "Events Played", "Initial Buy-Ins Paid",
+                                          "Nightly Payouts Earned", "Bounties Earned"])
+        out["Events Played"] = out["Events Played"].astype(int)
+        for col in ["Initial Buy-Ins Paid", "Nightly Payouts Earned", "Bounties Earned"]:
+            out[col] = out[col].astype(float)
+        out["Nightly Fees Paid"] = out["Events Played"] * 55.0
+        out["Bounty Contributions Paid"] = out["Events Played"] * 5.0
+        out["Total Paid In"] = out["Initial Buy-Ins Paid"] + out["Nightly Fees Paid"]
+        out["Total Earned"] = out["Nightly Payouts Earned"] + out["Bounties Earned"]
+        out["Net Winnings"] = out["Total Earned"] - out["Total Paid In"]
+        cols = ["Player","Events Played","Initial Buy-Ins Paid","Nightly Fees Paid","Bounty Contributions Paid","Nightly Payouts Earned","Bounties Earned","Total Paid In","Total Earned","Net Winnings"]
+        return out[cols].sort_values(["Net Winnings","Total Earned"], ascending=[False,False]).reset_index(drop=True)
+
+    def player_finances(self, player):
+        """One player's ``financials`` row as a dict, or None."""
+        fin = self.financials()
+        mine = fin[fin["Player"] == player]
+        return mine.iloc[0].to_dict() if len(mine) else None
+
+
+class LeagueReader(NamedTuple):
+    db: LeagueDB
+    sheets: LazySheetMap     # treat as read-only; shared between sessions
+    events: LazySheetMap     # LeagueDB.event_tables()
+
+
+def _db_stamp(path):
+    # Commits land in the -wal file until a checkpoint moves them into the
+    # database file, so both are part of the version. Opening a reader
+    # creates an empty -wal, which is the same version as none.
+    out = []
+    for p in (path, path + "-wal"):
+        try:
+            st = os.stat(p)
+            out.append((st.st_mtime_ns, st.st_size) if st.st_size else None)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+class _ReaderCache:
+    # One read-only connection and lazily loaded sheet map per database
+    # version, shared by every session in the process. A replaced entry is
+    # not closed (a rerun may still be querying it); its connection closes
+    # when the last reference goes.
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> LeagueReader:
+        stamp = _db_stamp(path)
+        with self._lock:
+            hit = self._entries.get(path)
+            if hit is not None and hit[0] == stamp:
+                count("sqlite_reader.hit")
+                return hit[1]
+            count("sqlite_reader.miss")
+            db = LeagueDB(path, readonly=True)
+            reader = LeagueReader(db, db.sheet_map(), db.event_tables())
+            self._entries[path] = (stamp, reader)
+            return reader
+
+
+_READERS = _ReaderCache()
+
+
+def open_reader(path: str = LEAGUE_DB) -> LeagueReader:
+    """Cached read-only view of ``path``, reopened only when the file changes."""
+    return _READERS.get(path)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ("import", "export"):
+        print("usage: python -m league_core.sqlite_store import TRACKER.xlsx LEAGUE.db\n"
+              "       python -m league_core.sqlite_store export LEAGUE.db TRACKER.xlsx")
+        return 2
+    cmd, src, dst = argv
+    if cmd == "import":
+        from league_core.workbook import parse_workbook
+
+        with open(src, "rb") as f:
+            sheets = parse_workbook(f.read())
+        with LeagueDB(dst) as db:
+            db.import_sheets(sheets)
+            print(f"{dst}: {len(db.sheet_names())} sheets imported from {src}")
+    else:
+        with LeagueDB(src, readonly=True) as db:
+            b = db.to_xlsx()
+        with open(dst, "wb") as f:
+            f.write(b)
+        print(f"{dst}: {len(b):,} bytes exported from {src}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""In-memory league store for the sheets the admin app mutates.
+
+``LeagueStore`` backs the ingest and opt-in paths. It keeps hash indexes
+(player name, ``(event #, item)`` for supplies, event numbers) and buffers
+new rows, which are concatenated onto each sheet once when the store is
+flushed back to the sheet map.
+"""
+import pandas as pd
+
+from league_core.columns import is_event_sheet
+
+PLAYER_COLUMNS = ["Player","Active"]
+LEDGER_COLUMNS = ["Date","Event #","Type","Pool","Amount","Immediate?","Note"]
+SUPPLY_COLUMNS = ["Event #","Date","Item","Amount","Notes"]
+OPTIN_COLUMNS = ["Event #","Player","Opt-In (Y/N)","Buy-In ($)"]
+
+
+class _Table:
+    """A sheet frame plus rows appended since the last flush."""
+
+    def __init__(self, base, columns):
+        self.base = base if isinstance(base, pd.DataFrame) else pd.DataFrame(columns=columns)
+        self.rows = []
+        self.replaced = False
+
+    @property
+    def dirty(self):
+        return bool(self.rows) or self.replaced
+
+    def append(self, row: dict):
+        self.rows.append(row)
+
+    def replace(self, frame):
+        self.base, self.rows, self.replaced = frame, [], True
+
+    def frame(self) -> pd.DataFrame:
+        if self.rows:
+            new = pd.DataFrame(self.rows)
+            if self.base.empty:
+                cols = list(self.base.columns) + [c for c in new.columns if c not in self.base.columns]
+                self.base = new.reindex(columns=cols)
+            else:
+                self.base = pd.concat([self.base, new], ignore_index=True)
+            self.rows = []
+            self.replaced = True
+        return self.base
+
+
+class LeagueStore:
+    def __init__(self, sheet_map):
+        self.sheet_map = sheet_map
+        self._tables = {}
+        self._players = None      # player -> True
+        self._supplies = None     # (event #, item) set
+        self._events = {int(n.split("_")[1]) for n in (sheet_map or {})
+                        if is_event_sheet(n) and str(n).split("_")[1].isdigit()}
+        self._standings = {}
+        self._event_dates = None
+
+    def _table(self, name, columns):
+        t = self._tables.get(name)
+        if t is None:
+            t = self._tables[name] = _Table((self.sheet_map or {}).get(name), columns)
+        return t
+
+    # Players ---------------------------------------------------------
+    def has_player(self, name) -> bool:
+        if self._players is None:
+            base = self._table("Players", PLAYER_COLUMNS).base
+            self._players = dict.fromkeys(base["Player"]) if "Player" in base else {}
+        return name in self._players
+
+    def add_player(self, name, active=True) -> bool:
+        if self.has_player(name):
+            return False
+        self._players[name] = True
+        self._table("Players", PLAYER_COLUMNS).append({"Player": name, "Active": active})
+        return True
+
+    # Pools ledger ----------------------------------------------------
+    def post(self, date, event, type_, pool, amount, immediate="", note=""):
+        self._table("Pools_Ledger", LEDGER_COLUMNS).append(dict(zip(
+            LEDGER_COLUMNS, [date, event, type_, pool, amount, immediate, note])))
+
+    # Supplies --------------------------------------------------------
+    def has_supply(self, event, item) -> bool:
+        if self._supplies is None:
+            base = self._table("Supplies", SUPPLY_COLUMNS).base
+            self._supplies = (set(zip(base["Event #"], base["Item"]))
+                              if {"Event #", "Item"} <= set(base.columns) else set())
+        return (event, item) in self._supplies
+
+    def add_supply(self, event, date, item, amount, notes="", unique=True) -> bool:
+        exists = self.has_supply(event, item)   # also builds the index
+        if unique and exists:
+            return False
+        self._supplies.add((event, item))
+        self._table("Supplies", SUPPLY_COLUMNS).append(dict(zip(
+            SUPPLY_COLUMNS, [event, date, item, amount, notes])))
+        return True
+
+    # Events ----------------------------------------------------------
+    def next_event_number(self) -> int:
+        return max(self._events) + 1 if self._events else 1
+
+    def event_date(self, event):
+        if self._event_dates is None:
+            ev = (self.sheet_map or {}).get("Events", pd.DataFrame())
+            self._event_dates = {}
+            if isinstance(ev, pd.DataFrame) and {"Event #", "Date"} <= set(ev.columns):
+                for n, d in zip(ev["Event #"], ev["Date"]):
+                    self._event_dates.setdefault(n, d)
+        return self._event_dates.get(event)
+
+    def set_standings(self, event, standings: pd.DataFrame):
+        self._events.add(event)
+        self._standings[f"Event_{event}_Standings"] = standings
+
+    # Second chance opt-ins -------------------------------------------
+    def set_optins(self, event, players, buy_in=100.00):
+        t = self._table("SecondChance_OptIns", OPTIN_COLUMNS)
+        cur = t.frame()
+        keep = cur[cur["Event #"] != event] if "Event #" in cur else cur
+        new = pd.DataFrame([[event, p, "Y", buy_in] for p in players], columns=OPTIN_COLUMNS)
+        frames = [f for f in (keep, new) if not f.empty]
+        out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=OPTIN_COLUMNS)
+        t.replace(out.sort_values(["Event #","Player"]).reset_index(drop=True))
+
+    # Export ----------------------------------------------------------
+    def changes(self) -> dict:
+        """Every sheet touched since the store was built, as frames."""
+        out = {name: t.frame() for name, t in self._tables.items() if t.dirty}
+        out.update(self._standings)
+        return out
+
+    def flush(self) -> dict:
+        """Write the touched sheets back into the sheet map; returns them."""
+        out = self.changes()
+        for name, df in out.items():
+            self.sheet_map[name] = df
+        return out
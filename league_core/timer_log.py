@@ -0,0 +1,202 @@
+"""Timer-log export ingest.
+
+``TableScanner`` is a streaming ``html.parser`` pass over an HTML export
+that keeps only the player-standings and round-players tables and stops
+feeding once it has both, so the level/blind history is never built. CSV
+exports of the standings are read directly; the player list then comes
+from the standings.
+
+``read_timer_log`` returns the normalized standings frame the admin ingest
+stores as ``Event_N_Standings``.
+"""
+import base64
+import binascii
+import io
+from html.parser import HTMLParser
+
+import pandas as pd
+
+from league_core.columns import colmap, norm, pick
+from league_core.money import parse_money_series
+from league_core.perf import timed
+
+CHUNK = 64 * 1024
+
+
+class TimerLogError(ValueError):
+    pass
+
+
+def decode_upload(raw: bytes) -> str:
+    """Timer exports are sometimes saved base64-encoded; accept either form."""
+    try:
+        decoded = base64.b64decode(b"".join(raw.split()), validate=True)
+    except (binascii.Error, ValueError):
+        decoded = None
+    if decoded and b"<" in decoded[:2048]:
+        raw = decoded
+    return raw.decode("utf-8-sig", "ignore")
+
+
+def _is_standings(header):
+    keys = {norm(h) for h in header}
+    return bool(keys & {"name", "player"}) and bool(keys & {"place", "rank", "finish", "position"})
+
+
+def _is_round_players(header):
+    return "players" in {norm(h) for h in header}
+
+
+class TableScanner(HTMLParser):
+    """Collect top-level tables as row lists until the standings and the
+    round-players tables have both been seen."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []        # [(header, rows)]
+        self.standings = None
+        self.round_players = None
+        self._depth = 0
+        self._rows = None
+        self._row = None
+        self._cell = None
+        self._row_is_head = False
+        self._in_thead = False
+
+    @property
+    def done(self):
+        # Without a recognizable "Players" header the table right after the
+        # standings is taken as the round-players table.
+        return self.standings is not None and (
+            self.round_players is not None or len(self.tables) > self.standings + 1)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._depth += 1
+            if self._depth == 1:
+                self._rows = []
+        elif self._depth != 1:
+            return
+        elif tag == "thead":
+            self._in_thead = True
+        elif tag == "tr":
+            self._row, self._row_is_head = [], self._in_thead
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            if tag == "td":
+                self._row_is_head = self._in_thead
+            elif not self._row:
+                self._row_is_head = True
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self._depth:
+            self._depth -= 1
+            if self._depth == 0:
+                self._finish_table()
+        elif self._depth != 1:
+            return
+        elif tag == "thead":
+            self._in_thead = False
+        elif tag in ("td", "th") and self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self._rows.append((self._row_is_head, self._row))
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _finish_table(self):
+        rows = self._rows or []
+        self._rows = None
+        if rows and rows[0][0]:
+            header, body = rows[0][1], [r for _, r in rows[1:]]
+        else:
+            width = max((len(r) for _, r in rows), default=0)
+            header, body = list(range(width)), [r for _, r in rows]
+        idx = len(self.tables)
+        self.tables.append((header, body))
+        if self.standings is None and _is_standings(header):
+            self.standings = idx
+        elif self.round_players is None and _is_round_players(header):
+            self.round_players = idx
+
+    def frame(self, idx):
+        header, body = self.tables[idx]
+        width = len(header)
+        body = [(r + [""] * width)[:width] for r in body]
+        df = pd.DataFrame(body, columns=header)
+        # Mirror read_html's type inference: blanks are NaN and all-numeric
+        # columns become numbers, so the stored Payout cells look the same.
+        df = df.replace("", float("nan"))
+        for c in df.columns:
+            try:
+                df[c] = pd.to_numeric(df[c])
+            except (ValueError, TypeError):
+                pass
+        return df
+
+
+def scan_tables(text: str, chunk: int = CHUNK) -> TableScanner:
+    p = TableScanner()
+    for i in range(0, len(text), chunk):
+        p.feed(text[i:i+chunk])
+        if p.done:
+            break
+    else:
+        p.close()
+    return p
+
+
+def normalize_standings(ps: pd.DataFrame, points: dict) -> pd.DataFrame:
+    psn = colmap(ps)
+    name_col = pick(psn, "name", "player")
+    place_col = pick(psn, "place", "rank", "finish", "position")
+    payout_col = pick(psn, "payout")
+    kos_col = pick(psn, "kos", "eliminations", "eliminated", "knockouts", "numeliminated")
+    if not (name_col and place_col and payout_col):
+        raise TimerLogError("Timer log missing required columns (Name/Player, Place, Payout).")
+    standings = ps[[place_col, payout_col, name_col] + ([kos_col] if kos_col else [])].copy()
+    standings.columns = ["Place","Payout","Player"] + (["KOs"] if kos_col else [])
+    if "KOs" not in standings.columns: standings["KOs"]=0
+    standings["Place"] = pd.to_numeric(standings["Place"], errors="coerce")
+    standings = standings.dropna(subset=["Place"])
+    standings["KOs"] = pd.to_numeric(standings["KOs"], errors="coerce").fillna(0).astype(int)
+    standings["Points"] = standings["Place"].map(points).fillna(0)
+    standings["Bounty $ (KOs*5)"] = standings["KOs"]*5
+    widx = standings.index[standings["Place"]==1]
+    if len(widx): standings.loc[widx[0],"Bounty $ (KOs*5)"] += 5
+    standings["Payout_Amount"] = parse_money_series(standings["Payout"])
+    return standings
+
+
+@timed("ingest.timer_log")
+def read_timer_log(raw: bytes, points: dict):
+    """``(standings, players)`` from an HTML (optionally base64) or CSV export."""
+    text = decode_upload(raw)
+    if text.lstrip().startswith("<"):
+        scan = scan_tables(text)
+        if len(scan.tables) < 2 and scan.standings is None:
+            raise TimerLogError("Timer log has no player standings table.")
+        # Exports whose headers don't identify the tables fall back to the
+        # usual layout: round players right after the standings (the table
+        # TableScanner.done waits for).
+        si = scan.standings if scan.standings is not None else 0
+        ri = scan.round_players if scan.round_players is not None else si + 1
+        ps = scan.frame(si)
+        standings = normalize_standings(ps, points)
+        if ri < len(scan.tables):
+            rp = scan.frame(ri)
+            players_field = pick(colmap(rp), "players") or list(rp.columns)[0]
+            players = [p.strip() for p in str(rp.iloc[0][players_field]).split(",") if p.strip()]
+        else:
+            players = [str(p).strip() for p in standings["Player"] if str(p).strip()]
+    else:
+        ps = pd.read_csv(io.StringIO(text), sep=None, engine="python")
+        standings = normalize_standings(ps, points)
+        players = [str(p).strip() for p in standings["Player"] if str(p).strip()]
+    return standings, players
@@ -0,0 +1,254 @@
+"""Process-wide cache of parsed tracker workbooks.
+
+Streamlit re-executes the page script on every widget interaction, so the
+apps would otherwise re-parse the whole tracker with openpyxl on each rerun.
+Parsed sheet maps are cached by a SHA-256 of the workbook bytes and shared
+by every session in the process.
+
+Sheets are parsed lazily: the sheet names come from the workbook index
+(openpyxl ``read_only``), and each sheet is parsed the first time it is
+accessed, once per process.
+"""
+import hashlib
+import os
+import re
+import threading
+import zipfile
+from collections.abc import MutableMapping
+from io import BytesIO
+
+import pandas as pd
+
+from league_core.lru import LRU
+from league_core.perf import span, timed
+
+
+def content_hash(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+
+_FINGERPRINTS = LRU(512)   # id(frame) -> (frame, fingerprint)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a sheet frame (columns, index and values).
+
+    Memoized on the frame's identity, so asking again for an unchanged sheet
+    is a dict lookup; like the facts cache this assumes sheets are replaced
+    rather than edited in place."""
+    hit = _FINGERPRINTS.get(id(df))
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    h = hashlib.sha256(repr(list(df.columns)).encode())
+    h.update(repr(list(df.dtypes.astype(str))).encode())
+    if len(df):
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    fp = h.hexdigest()
+    _FINGERPRINTS.put(id(df), (df, fp))
+    return fp
+
+
+def parse_workbook(b: bytes) -> dict:
+    return pd.read_excel(BytesIO(b), sheet_name=None, engine="openpyxl")
+
+
+class LazyWorkbook:
+    """Sheet names plus a per-sheet loader; each sheet is loaded at most once.
+
+    Shared between sessions, so loads are serialized under a lock (openpyxl
+    read-only workbooks are not thread-safe)."""
+
+    def __init__(self, names, loader):
+        self.names = list(names)
+        self._loader = loader
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_xlsx(cls, b: bytes):
+        xl = pd.ExcelFile(BytesIO(b), engine="openpyxl")
+        return cls(xl.sheet_names, xl.parse)
+
+    def sheet(self, name):
+        df = self._sheets.get(name)
+        if df is None:
+            with self._lock:
+                df = self._sheets.get(name)
+                if df is None:
+                    with span("workbook.load_sheet"):
+                        df = self._sheets[name] = self._loader(name)
+        return df
+
+    def loaded(self):
+        return [n for n in self.names if n in self._sheets]
+
+
+class LazySheetMap(MutableMapping):
+    """Dict-like view of a ``LazyWorkbook`` with per-copy overrides.
+
+    Reads fall through to the shared workbook; assignments and deletions
+    (the ingest path adds and replaces sheets) stay local to this map, so
+    ``copy()`` is cheap and never forces a parse.
+    """
+
+    def __init__(self, book: LazyWorkbook, local=None, order=None):
+        self._book = book
+        self._local = dict(local or {})
+        self._order = list(book.names if order is None else order)
+
+    def __getitem__(self, name):
+        if name in self._local:
+            return self._local[name]
+        if name in self._order:
+            return self._book.sheet(name)
+        raise KeyError(name)
+
+    def __setitem__(self, name, df):
+        if name not in self._order:
+            self._order.append(name)
+        self._local[name] = df
+
+    def __delitem__(self, name):
+        if name not in self._order:
+            raise KeyError(name)
+        self._order.remove(name)
+        self._local.pop(name, None)
+
+    def __iter__(self):
+        return iter(list(self._order))
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, name):
+        return name in self._order
+
+    def copy(self):
+        return LazySheetMap(self._book, self._local, self._order)
+
+    def __repr__(self):
+        return f"LazySheetMap({self._order!r}, loaded={self._book.loaded()!r})"
+
+
+def lazy_workbook(b: bytes) -> LazySheetMap:
+    return LazySheetMap(LazyWorkbook.from_xlsx(b))
+
+
+def _canonical_xlsx(b: bytes) -> bytes:
+    # openpyxl stamps the save time into docProps/core.xml and every zip
+    # entry; pin both so identical sheets always serialize to identical bytes
+    # (and a publish of an unchanged workbook can be skipped by hash).
+    out = BytesIO()
+    with zipfile.ZipFile(BytesIO(b)) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == "docProps/core.xml":
+                data = re.sub(rb"(<dcterms:(created|modified)[^>]*>)[^<]*", rb"\g<1>2000-01-01T00:00:00Z", data)
+            dst.writestr(zipfile.ZipInfo(info.filename, date_time=(1980, 1, 1, 0, 0, 0)), data,
+                         compress_type=zipfile.ZIP_DEFLATED)
+    return out.getvalue()
+
+
+@timed("export.xlsx")
+def serialize_workbook(sheet_map: dict) -> bytes:
+    """Write every DataFrame sheet to xlsx bytes in memory, deterministically."""
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for name, df in (sheet_map or {}).items():
+            if isinstance(df, pd.DataFrame):
+                df.to_excel(writer, sheet_name=str(name)[:31], index=False)
+    return _canonical_xlsx(buf.getvalue())
+
+
+class WorkbookCache:
+    """Bounded LRU of ``{content hash: sheet map}`` with hit/miss counters.
+
+    Callers get a shallow copy of the cached map so a session can add or
+    replace sheets (as the ingest path does) without touching other sessions.
+    The DataFrames themselves are shared and must be copied before being
+    modified in place.
+    """
+
+    def __init__(self, maxsize: int = 8, parser=lazy_workbook):
+        self.maxsize = maxsize
+        self.parser = parser
+        self.hits = 0
+        self.misses = 0
+        self._entries = LRU(maxsize, "workbook_cache")
+        self._stat_digests = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, digest):
+        sheets = self._entries.get(digest)
+        if sheets is not None:
+            with self._lock:
+                self.hits += 1
+        return sheets
+
+    def _store(self, digest, sheets):
+        with self._lock:
+            self.misses += 1
+        self._entries.put(digest, sheets)
+
+    @timed("workbook.read_bytes")
+    def read_bytes(self, b: bytes) -> dict:
+        digest = content_hash(b)
+        sheets = self._lookup(digest)
+        if sheets is None:
+            sheets = self.parser(b)
+            self._store(digest, sheets)
+        return sheets.copy()
+
+    @timed("workbook.read_path")
+    def read_path(self, path: str) -> dict:
+        # (mtime, size) -> digest lets an unchanged file skip both the read
+        # and the hash; a touched file is re-hashed, and only re-parsed if its
+        # bytes actually changed.
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        digest = self._stat_digests.get(path, (None, None))
+        if digest[0] == stamp:
+            sheets = self._lookup(digest[1])
+            if sheets is not None:
+                return sheets.copy()
+        with open(path, "rb") as f:
+            b = f.read()
+        digest = content_hash(b)
+        self._stat_digests[path] = (stamp, digest)
+        sheets = self._lookup(digest)
+        if sheets is None:
+            # A columnar snapshot built from these exact bytes loads much
+            # faster than openpyxl; see league_core.snapshot.
+            from league_core.snapshot import read_snapshot, refresh_snapshot, snapshot_path
+            sheets = read_snapshot(snapshot_path(path), digest)
+            if sheets is None:
+                sheets = self.parser(b)
+                refresh_snapshot(path, b, digest)
+            self._store(digest, sheets)
+        return sheets.copy()
+
+    def path_digest(self, path: str) -> str:
+        """SHA-256 of a file, memoized on (mtime, size) like ``read_path``."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = self._stat_digests.get(path)
+        if hit and hit[0] == stamp:
+            return hit[1]
+        with open(path, "rb") as f:
+            digest = content_hash(f.read())
+        self._stat_digests[path] = (stamp, digest)
+        return digest
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stat_digests.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._entries), "maxsize": self.maxsize}
+
+
+WORKBOOK_CACHE = WorkbookCache()
@@ -1,97 +1,21 @@
-
-import streamlit as st, pandas as pd, re, base64, requests
-from io import BytesIO
-
-import pandas as pd, re, base64, requests
-from io import BytesIO
-
-POINTS = {1:14,2:11,3:9,4:7,5:5,6:4,7:3,8:2,9:1,10:0.5}
-
-def parse_money(x):
-    if pd.isna(x): return 0.0
-    if isinstance(x,(int,float)): return float(x)
-    s = str(x).replace("$","").replace(",","").strip()
-    neg = False
-    if s.startswith("(") and s.endswith(")"):
-        neg = True; s = s[1:-1]
-    try:
-        v = float(s)
-        return -v if neg else v
-    except:
-        return 0.0
-
-def read_tracker_bytes(b: bytes):
-    return pd.read_excel(BytesIO(b), sheet_name=None, engine="openpyxl")
-
-def read_local_tracker():
-    try:
-        with open("tracker.xlsx","rb") as f:
-            b = f.read()
-        return read_tracker_bytes(b)
-    except Exception:
-        return None
-
-def pools_balance_robust(pools_df, pool_name):
-    if pools_df is None or isinstance(pools_df, dict) or pools_df is pd.NA:
-        return 0.0
-    if pools_df is None or pools_df.empty: return 0.0
-    df = pools_df.copy()
-    cols = {re.sub(r'[^a-z0-9]','', str(c).lower()): c for c in df.columns}
-    tcol = cols.get("type"); pcol = cols.get("pool")
-    acol = cols.get("amount") or cols.get("amt") or cols.get("value")
-    if not (tcol and pcol and acol): return 0.0
-    tmp = pd.DataFrame({
-        "_type": df[tcol].astype(str).str.strip().str.lower(),
-        "_pool": df[pcol].astype(str).str.strip().str.lower(),
-        "_amt":  df[acol].apply(parse_money)
-    })
-    tmp["_sign"] = tmp["_type"].map({"accrual":1,"payout":-1}).fillna(1)
-    return float((tmp.loc[tmp["_pool"]==pool_name.lower(), "_amt"] * tmp.loc[tmp["_pool"]==pool_name.lower(), "_sign"]).sum())
-
-def robust_leaderboard(sheet_map: dict) -> pd.DataFrame:
-    frames = []
-    for name, df in (sheet_map or {}).items():
-        if not isinstance(df, pd.DataFrame): continue
-        nm = str(name).lower()
-        if not (nm.startswith("event_") and nm.endswith("_standings")): continue
-        if df.empty: continue
-        key = {re.sub(r'[^a-z0-9]','', str(c).lower()): c for c in df.columns}
-        pcol = key.get("player") or key.get("name")
-        plcol = key.get("place") or key.get("rank") or key.get("finish") or key.get("position")
-        kcol  = key.get("kos") or key.get("knockouts") or key.get("eliminations") or key.get("elims") or key.get("numeliminated") or key.get("eliminated")
-        if not (pcol and plcol): continue
-        t = pd.DataFrame({
-            "Player": df[pcol].astype(str).str.strip(),
-            "Place": pd.to_numeric(df[plcol], errors="coerce")
-        })
-        t["KOs"] = pd.to_numeric(df[kcol], errors="coerce").fillna(0).astype(int) if kcol else 0
-        t = t.dropna(subset=["Place"])
-        t["Points"] = t["Place"].map(POINTS).fillna(0)
-        frames.append(t)
-    if not frames:
-        return pd.DataFrame(columns=["Player","Total Points","Total KOs","Events Played"])
-    all_ev = pd.concat(frames, ignore_index=True)
-    g = (all_ev.groupby("Player", as_index=False)
-         .agg(Total_Points=("Points","sum"),
-              Total_KOs=("KOs","sum"),
-              Events_Played=("Points","count"))
-         .sort_values(["Total_Points","Total_KOs"], ascending=[False,False])
-         .reset_index(drop=True))
-    g.index = g.index + 1
-    return g
-
-def show_logo(st):
-    # Do not ship/overwrite user's logo; try to load if present.
-    try:
-        st.image("league_logo.jpg", use_column_width=True)
-    except Exception:
-        try:
-            st.image("league_logo.png", use_column_width=True)
-        except Exception:
-            st.markdown("### League")
-
+import streamlit as st, pandas as pd
+
+from league_core import perf
+from league_core.assets import show_logo
+from league_core.facts import event_tables, event_views, player_history, player_index
+from league_core.finance import financials, player_finances
+from league_core.github import fetch_tracker
+from league_core.leaderboard import LeaderboardAggregator
+from league_core.league import POINTS, TRACKER_PATH, kpi_totals, read_local_tracker, read_tracker_bytes
+from league_core.publish import SITE_DIR, load_view
+from league_core.pools import pool_balances
+from league_core.projection import project_season, remaining_events
+from league_core.sqlite_store import LEAGUE_DB, open_reader
+from league_core.workbook import WORKBOOK_CACHE
 
 st.set_page_config(page_title="WSOP League — Player Home", page_icon="🃏", layout="wide")
+perf.bind(st.session_state.setdefault("perf", perf.Recorder()))
+rerun_timer = perf.Timer("rerun.player_home")
 
 col_logo, col_title = st.columns([1,4])
 with col_logo: show_logo(st)
@@ -105,41 +29,48 @@ st.divider()
 source_label = "Repo file (bundled)"
 sheet_map = read_local_tracker()
 
-mode = st.sidebar.radio("Load tracker from", ["Repo file (default)","Upload file","Fetch from GitHub (no cache)"], index=0)
+db = reader = None
+mode = st.sidebar.radio("Load tracker from", ["Repo file (default)","Upload file","Fetch from GitHub (revalidated)","SQLite database (league.db)"], index=0)
 
 if mode == "Upload file":
     up = st.sidebar.file_uploader("Upload tracker (.xlsx)", type=["xlsx"])
     if up:
         sheet_map = read_tracker_bytes(up.read())
         source_label = "Uploaded file"
-elif mode == "Fetch from GitHub (no cache)":
+elif mode == "Fetch from GitHub (revalidated)":
     owner_repo = st.sidebar.text_input("Owner/Repo", value="mmartuko15/wsop-league-app")
     branch = st.sidebar.text_input("Branch", value="main")
     token = st.secrets.get("PLAYER_GITHUB_TOKEN","")
     if st.sidebar.button("Fetch via API now"):
         try:
-            url = f"https://api.github.com/repos/{owner_repo}/contents/tracker.xlsx"
-            headers = {"Authorization": f"token {token}"} if token else {}
-            r = requests.get(url, headers=headers, params={"ref": branch}, timeout=20)
-            r.raise_for_status()
-            content_b64 = r.json()["content"]
-            data = base64.b64decode(content_b64)
-            sheet_map = read_tracker_bytes(data)
-            source_label = f"GitHub API — {owner_repo}@{branch}"
-            st.sidebar.success("Fetched latest tracker via API.")
+            gh_map, info = fetch_tracker(owner_repo, branch, token)
+            st.session_state["gh_tracker"] = (f"GitHub API — {owner_repo}@{branch}", gh_map)
+            st.sidebar.success("Tracker unchanged since last fetch." if info["cached"] else "Fetched latest tracker via API.")
         except Exception as e:
             st.sidebar.error(f"Fetch failed: {e}")
+    if "gh_tracker" in st.session_state:
+        source_label, sheet_map = st.session_state["gh_tracker"]
+elif mode == "SQLite database (league.db)":
+    try:
+        reader = open_reader(LEAGUE_DB)
+        db, sheet_map = reader.db, reader.sheets
+        source_label = f"SQLite — {LEAGUE_DB}"
+    except Exception as e:
+        st.sidebar.error(f"Could not open {LEAGUE_DB}: {e}")
 
 if sheet_map is None:
     st.info("No tracker found. Add tracker.xlsx to repo or upload one.")
     st.stop()
 
+# Views prebuilt by `python -m league_core.publish` for exactly this tracker.
+prebuilt = {}
+if mode == "Repo file (default)":
+    digest = WORKBOOK_CACHE.path_digest(TRACKER_PATH)
+    prebuilt = {n: load_view(SITE_DIR, n, digest) for n in ("leaderboard", "finances")}
+
 # Pools / KPIs
-pools = sheet_map.get("Pools_Ledger", pd.DataFrame())
-wsop_total = pools_balance_robust(pools,"WSOP")
-bounty_total = pools_balance_robust(pools,"Bounty")
-highhand_total = pools_balance_robust(pools,"High Hand")
-nightly_total = pools_balance_robust(pools,"Nightly")
+bal = db.pool_balances() if db else pool_balances(sheet_map.get("Pools_Ledger", pd.DataFrame()))
+wsop_total, bounty_total, highhand_total, nightly_total = kpi_totals(bal)
 
 k1,k2,k3,k4,k5 = st.columns(5)
 k1.metric("WSOP Pool", f"${wsop_total:,.2f}")
@@ -152,65 +83,71 @@ k5.metric("Nightly Pool (post-payout)", f"${nightly_total:,.2f}")
 
 st.info(f"**Data source:** {source_label}")
 
-tabs = st.tabs(["Leaderboard","Events","Nightly Payouts","Bounties","High Hand","Second Chance","Player Finances","About"])
+# Personal dashboard: only the selected player's rows are looked up and sent.
+players = db.player_names() if db else sorted(player_index(sheet_map))
+me = st.sidebar.selectbox("My results", ["(whole league)"] + players, index=0)
+if me != "(whole league)":
+    hist = db.player_history(me) if db else player_history(sheet_map, me)
+    hist = hist.assign(Points=hist["Place"].map(POINTS).fillna(0).astype(float), **{"Bounty $": hist["KOs"] * 5})
+    fin = (db.player_finances(me) if db else player_finances(sheet_map, me)) or {}
+    st.subheader(f"My results — {me}")
+    m1,m2,m3,m4,m5 = st.columns(5)
+    m1.metric("Events Played", len(hist))
+    m2.metric("Best Finish", int(hist["Place"].min()) if hist["Place"].notna().any() else "—")
+    m3.metric("Points", f"{hist['Points'].sum():g}")
+    m4.metric("KOs", int(hist["KOs"].sum()))
+    m5.metric("Net Winnings", f"${fin['Net Winnings']:,.2f}" if fin else "—")
+    st.write("**Points trend**")
+    st.line_chart(hist.set_index("Event")["Points"].cumsum().rename("Season points"))
+    st.write("**Finishes**")
+    st.dataframe(hist[["Event","Place","Points","KOs","Bounty $","Payout"]], use_container_width=True, hide_index=True)
+    st.write(f"**Payouts:** ${hist['Payout'].sum():,.2f} • **Bounties:** ${hist['Bounty $'].sum():,.2f}")
+    rerun_timer.stop()
+    st.stop()
 
-def build_event_view(df: pd.DataFrame) -> pd.DataFrame:
-    cols = {re.sub(r'[^a-z0-9]','', c.lower()): c for c in df.columns}
-    pcol = cols.get("player") or cols.get("name")
-    place_col = cols.get("place") or cols.get("rank") or cols.get("finish") or cols.get("position")
-    payout_col = cols.get("payout") or cols.get("payoutamount")
-    if not pcol:
-        return pd.DataFrame()
-    out = pd.DataFrame()
-    if place_col:
-        out["Place"] = pd.to_numeric(df[place_col], errors="coerce").astype("Int64")
-    else:
-        out["Place"] = pd.Series(range(1, len(df)+1), dtype="Int64")
-    out["Player"] = df[pcol].astype(str).str.strip()
-    if payout_col:
-        out["Payout"] = df[payout_col]
-    return out
+tabs = st.tabs(["Leaderboard","Events","Nightly Payouts","Bounties","High Hand","Second Chance","Player Finances","Seat Odds","About"])
 
 with tabs[0]:
-    lb = robust_leaderboard(sheet_map)
+    if db:
+        lb = db.leaderboard(POINTS)
+    elif prebuilt.get("leaderboard") is not None:
+        lb = prebuilt["leaderboard"].set_index("Rank").rename_axis(None)
+    else:
+        lb_engine = st.session_state.setdefault("lb_engine", LeaderboardAggregator(POINTS))
+        lb = lb_engine.sync(event_views(sheet_map)).to_frame()
     st.dataframe(lb, use_container_width=True)
 
 with tabs[1]:
     st.dataframe(sheet_map.get("Events", pd.DataFrame()), use_container_width=True)
 
+def event_page(key, views: dict):
+    """Window of ``views`` (already in event order) picked by a pager, so
+    only a few events are rendered however long the season gets."""
+    names = list(views)
+    c1, c2, c3 = st.columns([1,1,3])
+    per_page = c1.selectbox("Events per page", [1, 5, 10], index=1, key=f"{key}_per_page")
+    pages = max(1, -(-len(names) // per_page))
+    page = c2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=pages, key=f"{key}_page")
+    window = names[(page-1)*per_page : page*per_page]
+    c3.caption(f"Events {(page-1)*per_page+1}–{(page-1)*per_page+len(window)} of {len(names)}")
+    return [(s, views[s]) for s in window]
+
 with tabs[2]:
-    ev_sheets = [k for k in sheet_map.keys() if str(k).startswith("Event_") and str(k).endswith("_Standings")]
-    if ev_sheets:
-        for s in sorted(ev_sheets):
-            df = sheet_map[s]
-            view = build_event_view(df)
-            if not view.empty:
-                st.write(f"**{s}**")
-                st.dataframe(view, use_container_width=True, hide_index=True)
+    views = reader.events if reader else event_tables(sheet_map)
+    if views:
+        for s, view in event_page("payouts", views):
+            st.write(f"**{s}**")
+            cols = ["Place","Player"] + (["Payout"] if view["Payout"].notna().any() else [])
+            st.dataframe(view[cols], use_container_width=True, hide_index=True)
     else:
         st.info("Standings will appear after events are uploaded.")
 
 with tabs[3]:
-    ev_sheets = [k for k in sheet_map.keys() if str(k).startswith("Event_") and str(k).endswith("_Standings")]
-    if ev_sheets:
-        for s in sorted(ev_sheets):
-            df = sheet_map[s]
-            cols = {re.sub(r'[^a-z0-9]','', c.lower()): c for c in df.columns}
-            pcol = cols.get("player") or cols.get("name")
-            place_col = cols.get("place") or cols.get("rank") or cols.get("finish") or cols.get("position")
-            kos_col = cols.get("kos") or cols.get("knockouts") or cols.get("eliminations") or cols.get("elims")
-            if not pcol:
-                continue
-            view = pd.DataFrame()
-            if place_col:
-                view["Place"] = pd.to_numeric(df[place_col], errors="coerce").astype("Int64")
-            else:
-                view["Place"] = pd.Series(range(1, len(df)+1), dtype="Int64")
-            view["Player"] = df[pcol]
-            view["KOs"] = pd.to_numeric(df[kos_col], errors="coerce").fillna(0).astype(int) if kos_col else 0
-            view["Bounty $"] = view["KOs"] * 5
-            st.write(f"**{s}**")
-            st.dataframe(view, use_container_width=True, hide_index=True)
+    views = reader.events if reader else event_tables(sheet_map)
+    for s, view in (event_page("bounties", views) if views else []):
+        view = view[["Place","Player","KOs"]].assign(**{"Bounty $": view["KOs"] * 5})
+        st.write(f"**{s}**")
+        st.dataframe(view, use_container_width=True, hide_index=True)
     st.write(f"**Bounty Pool (live):** ${bounty_total:,.2f}")
     st.caption("Winner keeps their own $5 bounty; pool pays at final event.")
 
@@ -251,47 +188,31 @@ with tabs[5]:
     st.write(f"**Second Chance Pool (live):** ${sc_pool:,.2f}  \nPayout 50/30/20 at season end.")
 
 with tabs[6]:
-    def build_financials(sheet_map):
-        ev_sheets = [k for k in sheet_map.keys() if str(k).startswith("Event_") and str(k).endswith("_Standings")]
-        ev_frames = []
-        for s in ev_sheets:
-            df = sheet_map[s]
-            cols = {re.sub(r'[^a-z0-9]','', c.lower()): c for c in df.columns}
-            pcol = cols.get("player") or cols.get("name")
-            payout_col = cols.get("payout") or cols.get("payoutamount")
-            kos_col = cols.get("kos") or cols.get("knockouts") or cols.get("eliminations") or cols.get("elims")
-            if not (pcol and payout_col):
-                continue
-            t = pd.DataFrame()
-            t["Player"] = df[pcol].astype(str).str.strip()
-            t["Payout_Amount"] = df[payout_col].apply(parse_money)
-            t["BountyEarned"] = pd.to_numeric(df[kos_col], errors="coerce").fillna(0).astype(int)*5 if kos_col else 0
-            ev_frames.append(t)
-        all_rows = pd.concat(ev_frames, ignore_index=True) if ev_frames else pd.DataFrame(columns=["Player","Payout_Amount","BountyEarned"])
-        players_df = sheet_map.get("Players", pd.DataFrame(columns=["Player"]))
-        base = players_df[["Player"]].dropna().drop_duplicates().copy() if not players_df.empty else pd.DataFrame(columns=["Player"])
-        out = base.merge(all_rows.groupby("Player").size().rename("Events Played"), left_on="Player", right_index=True, how="left")
-        out = out.merge(all_rows.groupby("Player")["Payout_Amount"].sum().rename("Nightly Payouts Earned"), left_on="Player", right_index=True, how="left")
-        out = out.merge(all_rows.groupby("Player")["BountyEarned"].sum().rename("Bounties Earned"), left_on="Player", right_index=True, how="left")
-        out["Events Played"] = out["Events Played"].fillna(0).astype(int)
-        out["Nightly Fees Paid"] = out["Events Played"] * 55.0
-        out["Bounty Contributions Paid"] = out["Events Played"] * 5.0
-        buyins = sheet_map.get("Series_BuyIns", pd.DataFrame(columns=["Player","Amount"])).copy()
-        if not buyins.empty:
-            initial_buyins_paid = buyins.groupby("Player")["Amount"].sum().rename("Initial Buy-Ins Paid").to_frame()
-            out = out.merge(initial_buyins_paid, left_on="Player", right_index=True, how="left")
-        else:
-            out["Initial Buy-Ins Paid"] = 0.0
-        for col in ["Nightly Payouts Earned","Bounties Earned","Initial Buy-Ins Paid"]:
-            if col not in out.columns: out[col]=0.0
-            out[col] = out[col].fillna(0.0)
-        out["Total Paid In"] = out["Initial Buy-Ins Paid"] + out["Nightly Fees Paid"]
-        out["Total Earned"] = out["Nightly Payouts Earned"] + out["Bounties Earned"]
-        out["Net Winnings"] = out["Total Earned"] - out["Total Paid In"]
-        cols = ["Player","Events Played","Initial Buy-Ins Paid","Nightly Fees Paid","Bounty Contributions Paid","Nightly Payouts Earned","Bounties Earned","Total Paid In","Total Earned","Net Winnings"]
-        return out[cols].sort_values(["Net Winnings","Total Earned"], ascending=[False,False]).reset_index(drop=True)
-    fin = build_financials(sheet_map)
+    if db:
+        fin = db.financials()
+    elif prebuilt.get("finances") is not None:
+        fin = prebuilt["finances"]
+    else:
+        fin = financials(sheet_map)
     st.dataframe(fin, use_container_width=True)
 
 with tabs[7]:
+    st.subheader("Who can still make the 5 WSOP seats?")
+    c1, c2 = st.columns(2)
+    left = c1.number_input("Events left to play", min_value=0, max_value=52, value=min(remaining_events(sheet_map), 52))
+    sims = c2.selectbox("Simulated seasons", [5000, 10000, 20000], index=2)
+    proj = project_season(sheet_map, POINTS, remaining=int(left), sims=sims)
+    st.dataframe(proj.assign(P_Top5=proj["P_Top5"] * 100), use_container_width=True, hide_index=True, column_config={
+        "P_Top5": st.column_config.ProgressColumn("P(top 5)", format="%.1f%%", min_value=0, max_value=100),
+        "Expected_Points": st.column_config.NumberColumn("Expected points", format="%.1f"),
+        "Expected_KOs": st.column_config.NumberColumn("Expected KOs", format="%.1f"),
+        "Expected_Bounty": st.column_config.NumberColumn("Expected bounty", format="$%.2f"),
+    })
+    st.caption("Each simulated season replays the remaining events: players show up as often as they have so far, "
+               "finish according to their points per event so far, and score KOs at their usual rate. "
+               f"Seat value today: ${(wsop_total/5 if wsop_total else 0):,.2f} each.")
+
+with tabs[8]:
     st.write("Read-only view of league standings and finances.")
+
+rerun_timer.stop()
@@ -0,0 +1,74 @@
+"""Tracker publishing against the local GitHub stand-in: edits made on
+GitHub after the tracker was loaded must raise PublishConflict, never be
+overwritten.
+
+    python -m pytest tests
+"""
+import os
+
+import pytest
+
+from league_core.github import PublishConflict, fetch_bytes, git_blob_sha, publish_tracker
+from league_core.github_stub import GitHubStub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = "league/app"
+KEY = (REPO, "tracker.xlsx", "main")
+
+
+@pytest.fixture
+def loaded():
+    with open(os.path.join(ROOT, "tracker.xlsx"), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def gh(loaded):
+    with GitHubStub({KEY: loaded}) as stub:
+        yield stub
+
+
+def test_publish_then_unchanged_is_skipped(gh, loaded):
+    edited = loaded + b"\0edit"
+    res = publish_tracker(REPO, "main", "", edited, git_blob_sha(loaded), api_base=gh.base_url)
+    assert not res["skipped"]
+    assert res["sha"] == git_blob_sha(edited)
+    assert gh.files[KEY] == edited
+
+    res = publish_tracker(REPO, "main", "", edited, res["sha"], api_base=gh.base_url)
+    assert res["skipped"]
+    assert gh.stats["writes"] == 1
+
+
+def test_edit_on_github_conflicts(gh, loaded):
+    other = loaded + b"\0other"
+    gh.files[KEY] = other
+    with pytest.raises(PublishConflict):
+        publish_tracker(REPO, "main", "", loaded + b"\0mine", git_blob_sha(loaded), api_base=gh.base_url)
+    assert gh.files[KEY] == other
+    assert gh.stats["writes"] == 0
+
+
+def test_stale_fetched_sha_conflicts_then_fresh_sha_publishes(gh, loaded):
+    _, info = fetch_bytes(REPO, "main", api_base=gh.base_url)
+    edited, mine = loaded + b"\0edit", loaded + b"\0mine"
+    gh.files[KEY] = edited
+    with pytest.raises(PublishConflict):
+        publish_tracker(REPO, "main", "", mine, info["sha"], api_base=gh.base_url)
+    assert gh.files[KEY] == edited
+
+    _, info = fetch_bytes(REPO, "main", api_base=gh.base_url)
+    assert info["sha"] == git_blob_sha(edited)
+    res = publish_tracker(REPO, "main", "", mine, info["sha"], api_base=gh.base_url)
+    assert not res["skipped"]
+    assert gh.files[KEY] == mine
+
+
+def test_new_file_publishes_once(gh, loaded):
+    new = (REPO, "new.xlsx", "main")
+    res = publish_tracker(REPO, "main", "", loaded, None, path="new.xlsx", api_base=gh.base_url)
+    assert not res["skipped"]
+    assert gh.files[new] == loaded
+    with pytest.raises(PublishConflict):
+        publish_tracker(REPO, "main", "", loaded + b"\0edit", None, path="new.xlsx", api_base=gh.base_url)
+    assert gh.files[new] == loaded